@@ -0,0 +1,54 @@
+# benchmarks/bench_codec.py
+"""Micro-benchmarks for communication/message_format."""
+
+from benchmarks import scenarios
+from benchmarks.harness import benchmark
+from communication.message_format import decode_message, encode_message
+
+
+def _messages(quick, obstacles_per_vehicle):
+    return scenarios.fleet(100 if quick else 1000, obstacles_per_vehicle=obstacles_per_vehicle, seed=11)
+
+
+@benchmark("codec.encode.small")
+def encode_small(quick):
+    vehicles = _messages(quick, 5)
+
+    def run():
+        for v in vehicles:
+            encode_message(**v)
+
+    return run, len(vehicles)
+
+
+@benchmark("codec.encode.large")
+def encode_large(quick):
+    vehicles = _messages(quick, 200)
+
+    def run():
+        for v in vehicles:
+            encode_message(**v)
+
+    return run, len(vehicles)
+
+
+@benchmark("codec.decode.small")
+def decode_small(quick):
+    payloads = [encode_message(**v) for v in _messages(quick, 5)]
+
+    def run():
+        for p in payloads:
+            decode_message(p)
+
+    return run, len(payloads)
+
+
+@benchmark("codec.decode.large")
+def decode_large(quick):
+    payloads = [encode_message(**v) for v in _messages(quick, 200)]
+
+    def run():
+        for p in payloads:
+            decode_message(p)
+
+    return run, len(payloads)
@@ -0,0 +1,61 @@
+# benchmarks/bench_crypto.py
+"""Micro-benchmarks for communication/encryption.EncryptionManager."""
+
+import base64
+import random
+
+from benchmarks.harness import benchmark
+from communication.encryption import EncryptionManager
+
+
+def make_encryption(key_bytes=32, seed=5):
+    """EncryptionManager with a fixed, seeded AES key (never a real secret)."""
+    key = bytes(random.Random(seed).getrandbits(8) for _ in range(key_bytes))
+    return EncryptionManager({"encryption": {"enabled": True, "key": base64.b64encode(key).decode()}})
+
+
+def _payloads(quick, size):
+    rng = random.Random(size)
+    return [bytes(rng.getrandbits(8) for _ in range(size)) for _ in range(20 if quick else 100)]
+
+
+def _encrypt(quick, size):
+    enc = make_encryption()
+    payloads = _payloads(quick, size)
+
+    def run():
+        for p in payloads:
+            enc.encrypt(p)
+
+    return run, len(payloads)
+
+
+def _decrypt(quick, size):
+    enc = make_encryption()
+    tokens = [enc.encrypt(p) for p in _payloads(quick, size)]
+
+    def run():
+        for t in tokens:
+            enc.decrypt(t)
+
+    return run, len(tokens)
+
+
+@benchmark("crypto.encrypt.256B")
+def encrypt_256(quick):
+    return _encrypt(quick, 256)
+
+
+@benchmark("crypto.encrypt.4KB")
+def encrypt_4k(quick):
+    return _encrypt(quick, 4096)
+
+
+@benchmark("crypto.decrypt.256B")
+def decrypt_256(quick):
+    return _decrypt(quick, 256)
+
+
+@benchmark("crypto.decrypt.4KB")
+def decrypt_4k(quick):
+    return _decrypt(quick, 4096)
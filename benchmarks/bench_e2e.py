@@ -0,0 +1,107 @@
+# benchmarks/bench_e2e.py
+"""
+Headless end-to-end loop over loopback UDP:
+encode -> encrypt -> sendto -> recvfrom -> decrypt -> decode -> decide.
+No MetaDrive, no broadcast; sender and receiver share one process.
+"""
+
+import socket
+import threading
+
+from benchmarks import scenarios
+from benchmarks.bench_crypto import make_encryption
+from benchmarks.harness import benchmark
+from communication.message_format import encode_message
+from communication.receiver import process_datagram
+
+
+class LoopbackReceiver:
+    """Receiver thread running the real process_datagram pipeline."""
+
+    def __init__(self, encryption, planner):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.2)
+        self.address = self.sock.getsockname()
+        self.encryption = encryption
+        self.planner = planner
+        self.processed = 0
+        self.errors = 0
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while self._running:
+            try:
+                data, _ = self.sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            try:
+                process_datagram(data, self.encryption, self.planner)
+            except Exception:
+                self.errors += 1
+            with self._cond:
+                self.processed += 1
+                self._cond.notify()
+
+    def wait_for(self, count, timeout=2.0):
+        """Block until `count` datagrams have been handled; False on timeout (loss)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.processed >= count, timeout)
+
+    def close(self):
+        self._running = False
+        self._thread.join()
+        self.sock.close()
+
+
+def _loopback(quick, n_vehicles, obstacles_per_vehicle, window=32):
+    encryption = make_encryption()
+    planner = scenarios.make_planner()
+    vehicles = scenarios.fleet(n_vehicles, obstacles_per_vehicle=obstacles_per_vehicle, seed=3)
+    rounds = 2 if quick else 10
+
+    receiver = LoopbackReceiver(encryption, planner)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    stats = {"sent": 0, "lost": 0}
+
+    def run():
+        for _ in range(rounds):
+            for i, v in enumerate(vehicles):
+                raw = encryption.encrypt(encode_message(**v))
+                sender.sendto(raw, receiver.address)
+                stats["sent"] += 1
+                # Bounded in-flight window keeps the socket buffer from overflowing.
+                if (i + 1) % window == 0:
+                    target = stats["sent"] - stats["lost"]
+                    if not receiver.wait_for(target):
+                        stats["lost"] += target - receiver.processed
+        target = stats["sent"] - stats["lost"]
+        if not receiver.wait_for(target):
+            stats["lost"] += target - receiver.processed
+
+    def extra():
+        info = {"sent": stats["sent"], "lost": stats["lost"], "decode_errors": receiver.errors}
+        receiver.close()
+        sender.close()
+        return info
+
+    return run, rounds * len(vehicles), extra
+
+
+@benchmark("e2e.loopback.fleet10", repeat=3, quick_repeat=1)
+def loopback_fleet10(quick):
+    return _loopback(quick, 10, 5)
+
+
+@benchmark("e2e.loopback.fleet100", repeat=3, quick_repeat=1)
+def loopback_fleet100(quick):
+    return _loopback(quick, 100, 5)
+
+
+@benchmark("e2e.loopback.fleet100_dense", repeat=3, quick_repeat=1)
+def loopback_fleet100_dense(quick):
+    return _loopback(quick, 100, 50)
@@ -0,0 +1,137 @@
+# benchmarks/bench_fragment.py
+"""
+Fragmentation and reassembly from 1 KB to 1 MB messages.
+
+  fragment.inprocess.<size>  Fragmenter -> Reassembler with no sockets:
+                             the framing cost alone.
+  fragment.loopback.<size>   fragments sent over loopback UDP and
+                             reassembled on the same thread; reports
+                             goodput and reassembly latency (first
+                             fragment sent -> message complete).
+
+ops = messages.
+"""
+
+import os
+import socket
+import time
+
+from benchmarks.harness import benchmark
+from communication.fragmentation import Fragmenter, Reassembler
+from telemetry import metrics
+
+MTU = 1400
+SIZES = (("1KB", 1024), ("16KB", 16 * 1024), ("64KB", 64 * 1024), ("256KB", 256 * 1024), ("1MB", 1024 * 1024))
+
+
+def _messages(quick, size):
+    count = max(1, (2 if quick else 8) * (1024 * 1024) // (size * 64))
+    return [os.urandom(size) for _ in range(min(count, 64))]
+
+
+def _inprocess(quick, size):
+    fragmenter = Fragmenter(MTU)
+    reassembler = Reassembler()
+    messages = _messages(quick, size)
+    stats = {"fragments": 0, "bytes": 0, "seconds": 0.0, "incomplete": 0}
+
+    def run():
+        t0 = time.perf_counter()
+        for message in messages:
+            fragments = fragmenter.fragment(message)
+            out = None
+            for fragment in fragments:
+                out = reassembler.feed(fragment)
+            if out is None:
+                stats["incomplete"] += 1
+            stats["fragments"] += len(fragments)
+        stats["seconds"] += time.perf_counter() - t0
+        stats["bytes"] += size * len(messages)
+
+    def extra():
+        n = max(stats["bytes"] // size, 1)
+        return {"fragments_per_message": stats["fragments"] / n,
+                "goodput_MBps": stats["bytes"] / max(stats["seconds"], 1e-9) / 1e6,
+                "incomplete": stats["incomplete"]}
+
+    return run, len(messages), extra
+
+
+def _drain(sock):
+    """Discard fragments still queued from a message that was given up on."""
+    sock.settimeout(0.0)
+    try:
+        while True:
+            sock.recvfrom(65535)
+    except (BlockingIOError, socket.timeout):
+        pass
+    finally:
+        sock.settimeout(0.2)
+
+
+def _loopback(quick, size, window=64):
+    fragmenter = Fragmenter(MTU)
+    reassembler = Reassembler()
+    messages = _messages(quick, size)
+
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    rx.bind(("127.0.0.1", 0))
+    rx.settimeout(0.2)
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    address = rx.getsockname()
+    latency = metrics.LatencyHistogram()
+    stats = {"bytes": 0, "seconds": 0.0, "lost": 0}
+
+    def receive_one():
+        try:
+            return reassembler.feed(rx.recvfrom(65535)[0])
+        except socket.timeout:
+            return False  # a fragment was lost; give up on this message
+
+    def run():
+        for message in messages:
+            fragments = fragmenter.fragment(message)
+            t0 = time.perf_counter()
+            out = None
+            pending = 0
+            for fragment in fragments:
+                tx.sendto(fragment, address)
+                pending += 1
+                # Bounded in-flight window keeps the socket buffer from overflowing.
+                if pending == window:
+                    while pending and out is not False:
+                        out = receive_one()
+                        pending -= 1
+            while pending and out is not False:
+                out = receive_one()
+                pending -= 1
+            elapsed = time.perf_counter() - t0
+            if out is None or out is False:
+                stats["lost"] += 1
+                _drain(rx)
+                reassembler.clear()
+                continue
+            latency.record(elapsed)
+            stats["seconds"] += elapsed
+            stats["bytes"] += len(out)
+
+    def extra():
+        info = {"goodput_MBps": stats["bytes"] / max(stats["seconds"], 1e-9) / 1e6,
+                "reassembly_p50_us": latency.percentile(50) * 1e6 if latency.count else None,
+                "reassembly_p99_us": latency.percentile(99) * 1e6 if latency.count else None,
+                "lost": stats["lost"]}
+        rx.close()
+        tx.close()
+        return info
+
+    return run, len(messages), extra
+
+
+def _register(label, size):
+    benchmark(f"fragment.inprocess.{label}")(lambda quick: _inprocess(quick, size))
+    benchmark(f"fragment.loopback.{label}", repeat=3, quick_repeat=1)(lambda quick: _loopback(quick, size))
+
+
+for _label, _size in SIZES:
+    _register(_label, _size)
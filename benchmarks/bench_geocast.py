@@ -0,0 +1,110 @@
+# benchmarks/bench_geocast.py
+"""
+Per-receiver CPU per tick as the fleet grows, for three delivery modes:
+
+  broadcast      every receiver decrypts and decodes every message
+  header_filter  broadcast delivery, out-of-range senders dropped by the
+                 cleartext geocast header before decryption
+  multicast      cell-group delivery plus the header filter
+
+The fleet keeps a constant density (one vehicle per `spacing`^2 m^2), so
+with range filtering the work per receiver should stay flat while
+broadcast grows linearly with fleet size. ops = receivers.
+"""
+
+import math
+
+from benchmarks import scenarios
+from benchmarks.bench_crypto import make_encryption
+from benchmarks.harness import benchmark
+from communication.geocast import Geocast, SimulatedChannel, parse_header
+from communication.message_format import encode_message
+from communication.receiver import decode_datagram
+
+
+def _fleet_tick(n_vehicles, mode, spacing=40.0, cell_size=100.0):
+    """One tick of traffic, already delivered: {vehicle_id: [datagram, ...]} plus own cells."""
+    geocast = Geocast(cell_size=cell_size, range_cells=1, enabled=mode != "broadcast")
+    channel = SimulatedChannel(geocast, radio_range=None, multicast=mode == "multicast")
+    encryption = make_encryption()
+    vehicles = scenarios.fleet(n_vehicles, obstacles_per_vehicle=5,
+                               extent=spacing * math.sqrt(n_vehicles), seed=11)
+    for v in vehicles:
+        channel.attach(v["vehicle_id"], v["vehicle_pos"]["x"], v["vehicle_pos"]["y"])
+    for i, v in enumerate(vehicles):
+        x, y = v["vehicle_pos"]["x"], v["vehicle_pos"]["y"]
+        raw = encryption.encrypt(encode_message(seq=i + 1, timestamp=1000.0, **v))
+        channel.send(v["vehicle_id"], geocast.wrap(raw, x, y))
+
+    receivers = [(geocast.cell_of(*channel.position(v["vehicle_id"])) if geocast.enabled else None,
+                  channel.receive(v["vehicle_id"]))
+                 for v in vehicles]
+    return geocast, encryption, receivers
+
+
+def _receive(quick, n_vehicles, mode):
+    geocast, encryption, receivers = _fleet_tick(n_vehicles, mode)
+    if quick:
+        receivers = receivers[:25]  # per-receiver cost does not depend on how many we time
+    stats = {"decoded": 0}
+
+    def run():
+        decoded = 0
+        for own_cell, inbox in receivers:
+            for data in inbox:
+                if geocast.accept(data, own_cell):
+                    decode_datagram(parse_header(data)[2], encryption)
+                    decoded += 1
+        stats["decoded"] = decoded
+
+    def extra():
+        n = max(len(receivers), 1)
+        return {"delivered_per_receiver": sum(len(inbox) for _, inbox in receivers) / n,
+                "decrypted_per_receiver": stats["decoded"] / n}
+
+    return run, len(receivers), extra
+
+
+@benchmark("geocast.broadcast.25")
+def broadcast_25(quick):
+    return _receive(quick, 25, "broadcast")
+
+
+@benchmark("geocast.header_filter.25")
+def header_filter_25(quick):
+    return _receive(quick, 25, "header_filter")
+
+
+@benchmark("geocast.multicast.25")
+def multicast_25(quick):
+    return _receive(quick, 25, "multicast")
+
+
+@benchmark("geocast.broadcast.100")
+def broadcast_100(quick):
+    return _receive(quick, 100, "broadcast")
+
+
+@benchmark("geocast.header_filter.100")
+def header_filter_100(quick):
+    return _receive(quick, 100, "header_filter")
+
+
+@benchmark("geocast.multicast.100")
+def multicast_100(quick):
+    return _receive(quick, 100, "multicast")
+
+
+@benchmark("geocast.broadcast.400")
+def broadcast_400(quick):
+    return _receive(quick, 400, "broadcast")
+
+
+@benchmark("geocast.header_filter.400")
+def header_filter_400(quick):
+    return _receive(quick, 400, "header_filter")
+
+
+@benchmark("geocast.multicast.400")
+def multicast_400(quick):
+    return _receive(quick, 400, "multicast")
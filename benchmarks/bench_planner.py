@@ -0,0 +1,146 @@
+# benchmarks/bench_planner.py
+"""Micro-benchmarks for HybridAStar, MotionPrimitives and ResponsePlanner."""
+
+from benchmarks import scenarios
+from benchmarks.harness import benchmark
+from decision_engine.hybrid_astar import HybridAStar
+from decision_engine.motion_primitives import MotionPrimitives, Pose
+
+
+def _planning_problems(n_pairs, n_obstacles, seed):
+    pairs = scenarios.start_goal_pairs(n_pairs, extent=80.0, min_distance=30.0, seed=seed)
+    obstacles = scenarios.obstacle_field(n_obstacles, extent=100.0, seed=seed + 1)
+    obstacles = scenarios.clear_obstacles(obstacles, pairs)
+    return pairs, [(o["x"], o["y"]) for o in obstacles]
+
+
+def _hybrid_astar(quick, n_obstacles, max_iter=200, **planner_kwargs):
+    planner = HybridAStar(**planner_kwargs)
+    pairs, obstacles = _planning_problems(3 if quick else 10, n_obstacles, seed=42)
+    stats = {"iterations": 0, "found": 0, "analytic": 0, "plans": 0}
+
+    def run():
+        for start, goal in pairs:
+            planner.plan(start, goal, obstacles, max_iter=max_iter)
+            stats["plans"] += 1
+            for key in ("iterations", "found", "analytic"):
+                stats[key] += planner.last_stats[key]
+
+    def extra():
+        plans = max(stats["plans"], 1)
+        return {"mean_iterations": stats["iterations"] / plans,
+                "found_rate": stats["found"] / plans,
+                "analytic_rate": stats["analytic"] / plans}
+
+    return run, len(pairs), extra
+
+
+@benchmark("planner.hybrid_astar.empty")
+def hybrid_astar_empty(quick):
+    return _hybrid_astar(quick, 0)
+
+
+@benchmark("planner.hybrid_astar.sparse")
+def hybrid_astar_sparse(quick):
+    return _hybrid_astar(quick, 50)
+
+
+@benchmark("planner.hybrid_astar.dense")
+def hybrid_astar_dense(quick):
+    return _hybrid_astar(quick, 400)
+
+
+# Analytic expansion and smoothing switched off: the search alone, for
+# before/after comparison on a budget large enough to usually succeed.
+@benchmark("planner.hybrid_astar.sparse.search_only")
+def hybrid_astar_sparse_search_only(quick):
+    return _hybrid_astar(quick, 50, max_iter=2000, analytic_interval=0, smooth=False)
+
+
+@benchmark("planner.hybrid_astar.sparse.analytic")
+def hybrid_astar_sparse_analytic(quick):
+    return _hybrid_astar(quick, 50, max_iter=2000, analytic_interval=5, smooth=False)
+
+
+@benchmark("planner.hybrid_astar.sparse.analytic_smoothed")
+def hybrid_astar_sparse_analytic_smoothed(quick):
+    return _hybrid_astar(quick, 50, max_iter=2000, analytic_interval=5, smooth=True)
+
+
+# Anytime mode as ResponsePlanner runs it: one deadline-bounded call per tick,
+# resuming the same search until it completes. max_tick_ms is the worst
+# single-call latency (search plus path post-processing); p99_tick_ms and
+# late_ticks (calls over 110% of the deadline) are less sensitive to the
+# odd scheduler stall.
+@benchmark("planner.hybrid_astar.dense.anytime")
+def hybrid_astar_dense_anytime(quick):
+    planner = HybridAStar()
+    pairs, obstacles = _planning_problems(3 if quick else 10, 400, seed=42)
+    deadline_ms, max_ticks = 5.0, 40
+    stats = {"ticks": 0, "plans": 0, "found": 0, "tick_ms": []}
+
+    def run():
+        for start, goal in pairs:
+            planner.reset()
+            for _ in range(max_ticks):
+                planner.plan(start, goal, obstacles, max_iter=5000, deadline_ms=deadline_ms, resume=True)
+                stats["ticks"] += 1
+                stats["tick_ms"].append(planner.last_stats["elapsed_ms"])
+                if planner.last_stats["found"]:
+                    stats["found"] += 1
+                    break
+            stats["plans"] += 1
+
+    def extra():
+        plans = max(stats["plans"], 1)
+        ticks = sorted(stats["tick_ms"]) or [0.0]
+        return {"deadline_ms": deadline_ms,
+                "max_tick_ms": ticks[-1],
+                "p99_tick_ms": ticks[min(len(ticks) - 1, int(0.99 * len(ticks)))],
+                "late_ticks": sum(t > 1.1 * deadline_ms for t in ticks),
+                "mean_ticks": stats["ticks"] / plans,
+                "found_rate": stats["found"] / plans}
+
+    return run, len(pairs), extra
+
+
+@benchmark("planner.motion_primitives.expand")
+def motion_primitives_expand(quick):
+    mp = MotionPrimitives(steer_samples=5, allow_reverse=True)
+    poses = [Pose(float(i), float(i % 7), 0.1 * i) for i in range(200 if quick else 2000)]
+
+    def run():
+        for pose in poses:
+            mp.expand(pose)
+
+    return run, len(poses)
+
+
+def _decide(quick, n_obstacles):
+    planner = scenarios.make_planner()
+    vehicles = scenarios.fleet(50 if quick else 200, obstacles_per_vehicle=n_obstacles, seed=7)
+    # Keep obstacles beyond reroute range so this measures the decision scan, not Hybrid A*.
+    reroute = planner.thresholds.get("reroute_distance", 40)
+    for v in vehicles:
+        x, y = v["vehicle_pos"]["x"], v["vehicle_pos"]["y"]
+        v["obstacles"] = [o for o in v["obstacles"]
+                          if (o["x"] - x) ** 2 + (o["y"] - y) ** 2 > reroute ** 2]
+
+    inputs = [((v["vehicle_pos"]["x"], v["vehicle_pos"]["y"]), v["obstacles"], v["current_speed"])
+              for v in vehicles]
+
+    def run():
+        for pos, obstacles, speed in inputs:
+            planner.decide_action(pos, obstacles, speed)
+
+    return run, len(inputs)
+
+
+@benchmark("planner.decide_action.10")
+def decide_action_10(quick):
+    return _decide(quick, 10)
+
+
+@benchmark("planner.decide_action.100")
+def decide_action_100(quick):
+    return _decide(quick, 100)
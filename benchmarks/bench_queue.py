@@ -0,0 +1,83 @@
+# benchmarks/bench_queue.py
+"""
+LatestMessageQueue cost with duplicated and reordered traffic.
+
+  queue.offer_drain  offer/drain of already decoded messages.
+  queue.receive      encrypted messages with sequence headers through
+                     receive_message: duplicates and reordered messages
+                     are dropped by header before decryption.
+"""
+
+import random
+
+from benchmarks import scenarios
+from benchmarks.bench_crypto import make_encryption
+from benchmarks.harness import benchmark
+from communication.message_format import encode_message, pack_seq_header
+from communication.message_queue import LatestMessageQueue
+from communication.receiver import receive_message
+
+
+def _traffic(quick, n_vehicles=50, rounds=20, dup_rate=0.05, swap_rate=0.05, seed=17):
+    """Per-round messages from every vehicle, with some duplicated and some swapped."""
+    rng = random.Random(seed)
+    vehicles = scenarios.fleet(n_vehicles, obstacles_per_vehicle=0, seed=seed)
+    stream = []
+    for r in range(2 if quick else rounds):
+        for v in vehicles:
+            msg = {"vehicle_id": v["vehicle_id"], "seq": r + 1, "timestamp": 1000.0 + r * 0.05}
+            stream.append(msg)
+            if rng.random() < dup_rate:
+                stream.append(msg)
+    for i in range(1, len(stream)):
+        if rng.random() < swap_rate:
+            stream[i - 1], stream[i] = stream[i], stream[i - 1]
+    return stream, len(vehicles)
+
+
+@benchmark("queue.offer_drain")
+def offer_drain(quick):
+    stream, n_vehicles = _traffic(quick)
+    holder = {}
+
+    def run():
+        queue = LatestMessageQueue(max_age=0.5)
+        for i, msg in enumerate(stream):
+            queue.offer(msg, recv_time=msg["timestamp"] + 0.01)
+            if (i + 1) % n_vehicles == 0:
+                queue.drain(now=msg["timestamp"] + 0.01)
+        holder["queue"] = queue
+
+    def extra():
+        q = holder["queue"]
+        return {"accepted": q.accepted, "duplicates": q.duplicates,
+                "out_of_order": q.out_of_order, "coalesced": q.coalesced}
+
+    return run, len(stream), extra
+
+
+@benchmark("queue.receive")
+def receive(quick):
+    stream, n_vehicles = _traffic(quick, dup_rate=0.2, swap_rate=0.1)
+    encryption = make_encryption()
+    vehicles = {v["vehicle_id"]: v for v in scenarios.fleet(n_vehicles, obstacles_per_vehicle=20, seed=17)}
+    datagrams = [(pack_seq_header(m["vehicle_id"], m["seq"], m["timestamp"])
+                  + encryption.encrypt(encode_message(seq=m["seq"], timestamp=m["timestamp"],
+                                                      **vehicles[m["vehicle_id"]])),
+                  m["timestamp"] + 0.01)
+                 for m in stream]
+    holder = {}
+
+    def run():
+        queue = LatestMessageQueue(max_age=0.5)
+        for i, (data, now) in enumerate(datagrams):
+            receive_message(data, encryption, queue, now)
+            if (i + 1) % n_vehicles == 0:
+                queue.drain(now=now)
+        holder["queue"] = queue
+
+    def extra():
+        q = holder["queue"]
+        return {"decrypted": q.accepted, "dropped_before_decrypt": q.duplicates + q.out_of_order + q.stale}
+
+    return run, len(datagrams), extra
@@ -0,0 +1,70 @@
+# benchmarks/bench_ttc.py
+"""
+decide_action in "distance" vs "ttc" mode at 1,000+ obstacles, and the
+raw vectorized TTC kernel over fleet x obstacle pairs.
+"""
+
+import numpy as np
+
+from benchmarks import scenarios
+from benchmarks.harness import benchmark
+from decision_engine import ttc
+
+
+def _planner(mode):
+    planner = scenarios.make_planner()
+    planner.decision_mode = mode
+    return planner
+
+
+def _field(n_obstacles):
+    # Obstacles kept clear of the vehicle so neither mode triggers Hybrid A*;
+    # this measures the risk scan itself.
+    return scenarios.obstacle_field(n_obstacles, extent=400.0, seed=5, clear_radius=60.0)
+
+
+def _decide(quick, mode, n_obstacles):
+    planner = _planner(mode)
+    obstacles = _field(n_obstacles)
+    calls = 20 if quick else 200
+
+    def run():
+        for _ in range(calls):
+            planner.decide_action((0.0, 0.0), obstacles, 10.0, (10.0, 0.0))
+
+    return run, calls, {"obstacles": n_obstacles}
+
+
+@benchmark("ttc.decide.distance.1000")
+def decide_distance_1000(quick):
+    return _decide(quick, "distance", 1000)
+
+
+@benchmark("ttc.decide.ttc.1000")
+def decide_ttc_1000(quick):
+    return _decide(quick, "ttc", 1000)
+
+
+@benchmark("ttc.decide.distance.10000")
+def decide_distance_10000(quick):
+    return _decide(quick, "distance", 10000)
+
+
+@benchmark("ttc.decide.ttc.10000")
+def decide_ttc_10000(quick):
+    return _decide(quick, "ttc", 10000)
+
+
+@benchmark("ttc.kernel.100x1000")
+def kernel_fleet(quick):
+    rng = np.random.default_rng(9)
+    vehicles = rng.uniform(-200, 200, size=(100, 2))
+    velocities = rng.uniform(-20, 20, size=(100, 2))
+    obstacles = ttc.as_points(_field(1000))
+    calls = 5 if quick else 50
+
+    def run():
+        for _ in range(calls):
+            ttc.min_time_to_collision(vehicles, velocities, obstacles)
+
+    return run, calls, {"pairs": 100 * 1000}
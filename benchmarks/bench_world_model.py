@@ -0,0 +1,86 @@
+# benchmarks/bench_world_model.py
+"""
+WorldModel fusion cost, and decide_action on fused vs. raw per-sender
+obstacle lists for a fleet that all see the same obstacle field.
+"""
+
+from benchmarks import scenarios
+from benchmarks.harness import benchmark
+from decision_engine.world_model import WorldModel
+
+
+def _fleet(quick):
+    return scenarios.shared_obstacle_fleet(20 if quick else 100, n_obstacles=400, sensing_range=50.0, seed=21)
+
+
+@benchmark("world_model.update")
+def world_model_update(quick):
+    vehicles = _fleet(quick)
+    reports = sum(len(v["obstacles"]) for v in vehicles)
+    holder = {}
+
+    def run():
+        world = WorldModel(cell_size=5.0, dedup_radius=1.0, ttl=10.0)
+        for v in vehicles:
+            world.update(v, now=0.0)
+        holder["world"] = world
+
+    def extra():
+        world = holder["world"]
+        return {"reports": reports, "fused": len(world), "merged": world.merged}
+
+    return run, len(vehicles), extra
+
+
+@benchmark("world_model.query_radius")
+def world_model_query(quick):
+    vehicles = _fleet(quick)
+    world = WorldModel(cell_size=5.0, dedup_radius=1.0, ttl=10.0)
+    for v in vehicles:
+        world.update(v, now=0.0)
+    centers = [(v["vehicle_pos"]["x"], v["vehicle_pos"]["y"]) for v in vehicles]
+
+    def run():
+        for x, y in centers:
+            world.query_radius(x, y, 45.0)
+
+    return run, len(centers)
+
+
+def _far_planner():
+    # Thresholds small enough that no obstacle triggers a reroute: this
+    # isolates the cost of scanning the obstacle set.
+    planner = scenarios.make_planner()
+    planner.thresholds = {"brake_distance": 0.0, "slowdown_distance": 0.0, "reroute_distance": 0.0}
+    return planner
+
+
+@benchmark("world_model.decide.raw_union")
+def decide_raw_union(quick):
+    vehicles = _fleet(quick)
+    union = [o for v in vehicles for o in v["obstacles"]]
+    planner = _far_planner()
+    positions = [(v["vehicle_pos"]["x"], v["vehicle_pos"]["y"]) for v in vehicles]
+
+    def run():
+        for pos in positions:
+            planner.decide_action(pos, union, 10.0)
+
+    return run, len(positions), {"obstacles": len(union)}
+
+
+@benchmark("world_model.decide.fused")
+def decide_fused(quick):
+    vehicles = _fleet(quick)
+    world = WorldModel(cell_size=5.0, dedup_radius=1.0, ttl=10.0)
+    for v in vehicles:
+        world.update(v, now=0.0)
+    fused = world.obstacles()
+    planner = _far_planner()
+    positions = [(v["vehicle_pos"]["x"], v["vehicle_pos"]["y"]) for v in vehicles]
+
+    def run():
+        for pos in positions:
+            planner.decide_action(pos, fused, 10.0)
+
+    return run, len(positions), {"obstacles": len(fused)}
@@ -0,0 +1,70 @@
+# benchmarks/harness.py
+"""
+Tiny benchmark registry and timer.
+
+A benchmark is a setup function registered with @benchmark(name).
+setup(quick) builds its scenario (smaller when `quick` is set) and
+returns (run, ops) or (run, ops, extra): `run` is a zero-argument
+callable that performs `ops` operations, and `extra` is an optional
+dict (or callable returning one) of additional figures to report. The
+harness calls run() `repeat` times and reports per-operation timings.
+"""
+
+import gc
+import statistics
+import time
+
+BENCHMARKS = {}
+
+
+def benchmark(name, repeat=5, quick_repeat=2):
+    """Register a benchmark setup function under a dotted name (e.g. "codec.encode")."""
+
+    def decorator(setup):
+        if name in BENCHMARKS:
+            raise ValueError(f"[BENCH] Duplicate benchmark name: {name}")
+        BENCHMARKS[name] = {"setup": setup, "repeat": repeat, "quick_repeat": quick_repeat}
+        return setup
+
+    return decorator
+
+
+def run_benchmark(name, quick=False):
+    """
+    Run one registered benchmark.
+    :return: dict with per-op seconds (min/median/mean/stdev), ops/sec and any extra info
+    """
+    entry = BENCHMARKS[name]
+    setup = entry["setup"]
+    result = setup(quick)
+    run, ops = result[0], result[1]
+    extra = result[2] if len(result) > 2 else None
+
+    repeat = entry["quick_repeat"] if quick else entry["repeat"]
+    run()  # warm-up (imports, caches, socket buffers)
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - t0) / ops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    median = statistics.median(samples)
+    out = {
+        "ops": ops,
+        "repeat": repeat,
+        "min": min(samples),
+        "median": median,
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "ops_per_sec": 1.0 / median if median > 0 else float("inf"),
+    }
+    if extra:
+        out["extra"] = extra() if callable(extra) else extra
+    return out
@@ -0,0 +1,170 @@
+# benchmarks/run.py
+"""
+Run the benchmark suite and compare results against a saved baseline.
+
+    python benchmarks/run.py run --out logs/bench.json            # full suite
+    python benchmarks/run.py run --quick --filter codec,crypto     # subset, smaller scenarios
+    python benchmarks/run.py list
+    python benchmarks/run.py compare logs/baseline.json logs/bench.json --threshold 0.10
+
+`compare` exits with status 1 when any benchmark's time per op (median
+by default, see --metric) is more than `threshold` slower than the
+baseline.
+Everything runs offline; MetaDrive is never imported.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# Add project root to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.harness import BENCHMARKS, run_benchmark
+from telemetry.log import configure_logging
+
+BENCH_MODULES = (
+    "benchmarks.bench_planner",
+    "benchmarks.bench_codec",
+    "benchmarks.bench_crypto",
+    "benchmarks.bench_geocast",
+    "benchmarks.bench_fragment",
+    "benchmarks.bench_e2e",
+    "benchmarks.bench_world_model",
+    "benchmarks.bench_queue",
+    "benchmarks.bench_ttc",
+)
+
+
+def load_benchmarks():
+    for module in BENCH_MODULES:
+        importlib.import_module(module)
+
+
+def _selected(filters):
+    names = sorted(BENCHMARKS)
+    if not filters:
+        return names
+    return [n for n in names if any(n.startswith(f) or f in n for f in filters)]
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def cmd_run(args):
+    filters = [f for f in (args.filter or "").split(",") if f]
+    results = {}
+    for name in _selected(filters):
+        print(f"[BENCH] {name} ...", end=" ", flush=True)
+        res = run_benchmark(name, quick=args.quick)
+        results[name] = res
+        print(f"{res['median'] * 1e6:10.1f} us/op  {res['ops_per_sec']:12,.0f} ops/s"
+              + (f"  {res['extra']}" if "extra" in res else ""))
+
+    report = {
+        "timestamp": time.time(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": results,
+    }
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[BENCH] Results written to {args.out}")
+    return 0
+
+
+def compare(baseline, current, threshold=0.10, metric="median"):
+    """
+    :param metric: per-op statistic to compare ("median", "min" or "mean")
+    :return: list of (name, base_value, new_value, ratio, status) over the union of both files
+    """
+    rows = []
+    for name in sorted(set(baseline["results"]) | set(current["results"])):
+        base = baseline["results"].get(name)
+        new = current["results"].get(name)
+        if base is None or new is None:
+            rows.append((name, base and base[metric], new and new[metric], None,
+                         "NEW" if base is None else "MISSING"))
+            continue
+        ratio = new[metric] / base[metric] if base[metric] > 0 else float("inf")
+        if ratio > 1.0 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1.0 - threshold:
+            status = "FASTER"
+        else:
+            status = "ok"
+        rows.append((name, base[metric], new[metric], ratio, status))
+    return rows
+
+
+def cmd_compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold, args.metric)
+    regressions = 0
+    print(f"{'benchmark':<40s} {'base us/op':>12s} {'new us/op':>12s} {'ratio':>7s}  status")
+    for name, base, new, ratio, status in rows:
+        fmt = lambda v: f"{v * 1e6:12.1f}" if v is not None else f"{'-':>12s}"
+        ratio_s = f"{ratio:7.2f}" if ratio is not None else f"{'-':>7s}"
+        print(f"{name:<40s} {fmt(base)} {fmt(new)} {ratio_s}  {status}")
+        regressions += status == "REGRESSION"
+
+    if regressions:
+        print(f"[BENCH] {regressions} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    print("[BENCH] No regressions.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="V2V benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run benchmarks")
+    p_run.add_argument("--out", default=None, help="Write JSON results here")
+    p_run.add_argument("--filter", default=None, help="Comma-separated name prefixes/substrings")
+    p_run.add_argument("--quick", action="store_true", help="Smaller scenarios, fewer repeats")
+
+    sub.add_parser("list", help="List benchmark names")
+
+    p_cmp = sub.add_parser("compare", help="Compare results against a baseline")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=0.10,
+                       help="Relative slowdown that counts as a regression (0.10 = 10%%)")
+    p_cmp.add_argument("--metric", choices=["median", "min", "mean"], default="median",
+                       help="Per-op statistic to compare (min is steadiest on noisy machines)")
+    args = parser.parse_args()
+
+    # Keep planner warnings from flooding the output and skewing timings.
+    configure_logging({"logging": {"level": "ERROR"}})
+    load_benchmarks()
+
+    if args.command == "list":
+        for name in sorted(BENCHMARKS):
+            print(name)
+        return 0
+    if args.command == "run":
+        return cmd_run(args)
+    return cmd_compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
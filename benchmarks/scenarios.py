@@ -0,0 +1,114 @@
+# benchmarks/scenarios.py
+"""
+Seeded scenario generators shared by the benchmarks.
+The same (size, seed) always produces the same scenario, so results
+from different commits are comparable.
+"""
+
+import math
+import os
+import random
+
+from decision_engine.response_planner import ResponsePlanner
+
+DEFAULT_SEED = 1234
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+THRESHOLDS_FILE = os.path.join(CONFIG_DIR, "thresholds.yaml")
+SIM_PARAMS_FILE = os.path.join(CONFIG_DIR, "sim_params.yaml")
+
+
+def make_planner(vehicle_id="bench"):
+    """
+    ResponsePlanner built from the repo's config files by absolute path, so
+    its thresholds and planning time budget do not depend on the cwd.
+    """
+    return ResponsePlanner(vehicle_id, config_path=THRESHOLDS_FILE, sim_params_path=SIM_PARAMS_FILE)
+
+
+def obstacle_field(n, extent=100.0, seed=DEFAULT_SEED, clear_radius=0.0, center=(0.0, 0.0)):
+    """
+    Uniformly scattered point obstacles in a square of side `extent`.
+    :param clear_radius: keep this radius around `center` obstacle-free
+    :return: list of {"x": float, "y": float}
+    """
+    rng = random.Random(seed)
+    half = extent / 2.0
+    obstacles = []
+    while len(obstacles) < n:
+        x = center[0] + rng.uniform(-half, half)
+        y = center[1] + rng.uniform(-half, half)
+        if clear_radius and math.hypot(x - center[0], y - center[1]) < clear_radius:
+            continue
+        obstacles.append({"x": round(x, 3), "y": round(y, 3)})
+    return obstacles
+
+
+def start_goal_pairs(n, extent=100.0, min_distance=30.0, seed=DEFAULT_SEED):
+    """
+    Random (start, goal) pairs at least `min_distance` apart.
+    :return: list of ((sx, sy, heading), {"x": gx, "y": gy})
+    """
+    rng = random.Random(seed)
+    half = extent / 2.0
+    pairs = []
+    while len(pairs) < n:
+        sx, sy = rng.uniform(-half, half), rng.uniform(-half, half)
+        gx, gy = rng.uniform(-half, half), rng.uniform(-half, half)
+        if math.hypot(gx - sx, gy - sy) < min_distance:
+            continue
+        heading = math.atan2(gy - sy, gx - sx) + rng.uniform(-0.5, 0.5)
+        pairs.append(((sx, sy, heading), {"x": gx, "y": gy}))
+    return pairs
+
+
+def clear_obstacles(obstacles, pairs, radius=4.0):
+    """Drop obstacles sitting on top of any start or goal."""
+    points = []
+    for start, goal in pairs:
+        points.append((start[0], start[1]))
+        points.append((goal["x"], goal["y"]))
+    return [o for o in obstacles
+            if all(math.hypot(o["x"] - px, o["y"] - py) >= radius for px, py in points)]
+
+
+def fleet(n_vehicles, obstacles_per_vehicle=5, extent=200.0, seed=DEFAULT_SEED):
+    """
+    One V2V message worth of state per vehicle.
+    :return: list of dicts with encode_message keyword arguments
+    """
+    rng = random.Random(seed)
+    half = extent / 2.0
+    vehicles = []
+    for i in range(n_vehicles):
+        x, y = rng.uniform(-half, half), rng.uniform(-half, half)
+        vehicles.append({
+            "vehicle_id": f"vehicle_{i}",
+            "vehicle_pos": {"x": round(x, 3), "y": round(y, 3)},
+            "current_speed": round(rng.uniform(0.0, 30.0), 2),
+            "obstacles": obstacle_field(obstacles_per_vehicle, extent=60.0,
+                                        seed=seed * 7919 + i, center=(x, y)),
+        })
+    return vehicles
+
+
+def shared_obstacle_fleet(n_vehicles, n_obstacles=200, sensing_range=40.0, jitter=0.3,
+                          extent=200.0, seed=DEFAULT_SEED):
+    """
+    Fleet whose vehicles observe one common obstacle field: each vehicle
+    reports every obstacle within `sensing_range`, with position noise of
+    up to `jitter` meters, so the same obstacle arrives from many senders.
+    :return: list of dicts with encode_message keyword arguments
+    """
+    rng = random.Random(seed)
+    field = obstacle_field(n_obstacles, extent=extent, seed=seed + 1)
+    vehicles = []
+    for v in fleet(n_vehicles, obstacles_per_vehicle=0, extent=extent, seed=seed):
+        x, y = v["vehicle_pos"]["x"], v["vehicle_pos"]["y"]
+        v["obstacles"] = [
+            {"x": round(o["x"] + rng.uniform(-jitter, jitter), 3),
+             "y": round(o["y"] + rng.uniform(-jitter, jitter), 3)}
+            for o in field if math.hypot(o["x"] - x, o["y"] - y) <= sensing_range
+        ]
+        vehicles.append(v)
+    return vehicles
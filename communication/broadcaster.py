@@ -1,12 +1,31 @@
 # communication/broadcaster.py
 
-<<<<<<< HEAD
-import json
-import socket
 import argparse
+import os
+import socket
+import sys
 import time
+
 import yaml
-from encryption.encryption_utils import encrypt_message
+
+# Add project root to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from communication.encryption import EncryptionManager
+from communication.fragmentation import Fragmenter
+from communication.geocast import Geocast
+from communication.message_format import encode_message, pack_seq_header, unpack_position
+from telemetry import metrics
+from telemetry.log import configure_logging, get_logger
+
+logger = get_logger("broadcaster")
+
+
+def load_config(path):
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return yaml.safe_load(f)
+    return {}
 
 
 class Broadcaster:
@@ -21,7 +40,21 @@ class Broadcaster:
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         self.broadcast_ip = self.v2v_config.get("broadcast_ip", "<broadcast>")
 
-        print(f"[INFO] Broadcaster ready for {self.vehicle_id} ({self.sim_type.upper()})")
+        self.encryption = EncryptionManager(self.v2v_config)
+        self.seq = 0
+
+        # Geocast: send to the multicast group of our cell instead of broadcasting
+        self.geocast = Geocast.from_config(self.v2v_config)
+        if self.geocast.enabled:
+            ttl = int(self.v2v_config.get("geocast", {}).get("ttl", 1))
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+
+        # Messages longer than one datagram are split into fragments
+        mtu = int(self.v2v_config.get("communication", {}).get("mtu", 1400))
+        self.fragmenter = Fragmenter(mtu - self.geocast.overhead)
+
+        logger.info("[BROADCASTER] %s ready (%s) on port %d",
+                    self.vehicle_id, self.sim_type.upper(), self.broadcast_port)
 
     def _get_position_and_obstacles(self):
         """
@@ -37,52 +70,65 @@ class Broadcaster:
     def _get_current_speed(self):
         return 10.0  # Placeholder
 
+    def _get_velocity(self):
+        return [self._get_current_speed(), 0.0]  # Placeholder: heading along +x
+
     def broadcast(self, interval=1.0):
         latency = self.v2v_config.get("latency_ms", 0) / 1000.0
-        encryption_enabled = self.v2v_config.get("encryption", False)
 
-        print(f"[INFO] Broadcasting for {self.vehicle_id} every {interval}s "
-              f"(encryption={'ON' if encryption_enabled else 'OFF'})")
+        logger.info("[BROADCASTER] Broadcasting for %s every %ss (encryption=%s)",
+                    self.vehicle_id, interval, "ON" if self.encryption.enabled else "OFF")
 
         while True:
             try:
                 vehicle_pos, obstacles = self._get_position_and_obstacles()
-                message = {
-                    "vehicle_id": self.vehicle_id,
-                    "vehicle_pos": vehicle_pos,
-                    "current_speed": self._get_current_speed(),
-                    "obstacles": obstacles
-                }
 
-                raw = json.dumps(message).encode()
-                if encryption_enabled:
-                    raw = encrypt_message(raw)
+                self.seq += 1
+                timestamp = time.time()
+                with metrics.stage("encode"):
+                    raw = encode_message(self.vehicle_id, vehicle_pos, self._get_current_speed(), obstacles,
+                                         seq=self.seq, timestamp=timestamp, velocity=self._get_velocity())
+                with metrics.stage("encrypt"):
+                    raw = self.encryption.encrypt(raw)
+                # Cleartext copy of id/seq/timestamp so receivers can drop duplicates before decrypting
+                raw = pack_seq_header(self.vehicle_id, self.seq, timestamp) + raw
+
+                datagrams = self.fragmenter.fragment(raw)
+                destination = self.broadcast_ip
+                if self.geocast.enabled:
+                    x, y = unpack_position(vehicle_pos)
+                    datagrams = [self.geocast.wrap(d, x, y) for d in datagrams]
+                    destination = self.geocast.group_for(self.geocast.cell_of(x, y))
 
                 time.sleep(latency)  # simulate network latency
-                self.sock.sendto(raw, (self.broadcast_ip, self.broadcast_port))
-                print(f"[BROADCAST] Sent {len(obstacles)} obstacles from {self.vehicle_id}")
+                with metrics.stage("send"):
+                    for datagram in datagrams:
+                        self.sock.sendto(datagram, (destination, self.broadcast_port))
+
+                metrics.inc("v2v_messages_sent_total")
+                metrics.inc("v2v_datagrams_sent_total", len(datagrams))
+                metrics.inc("v2v_bytes_sent_total", sum(len(d) for d in datagrams))
+                logger.debug("[BROADCAST] Sent %d obstacles from %s", len(obstacles), self.vehicle_id)
 
             except Exception as e:
-                print(f"[ERROR] Broadcasting failed: {e}")
+                metrics.inc("v2v_send_errors_total")
+                logger.error("[BROADCAST] Broadcasting failed: %s", e)
 
             time.sleep(interval)
 
 
-def load_config(path):
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
-
-
 def main():
     parser = argparse.ArgumentParser(description="V2V Broadcaster")
     parser.add_argument("--vehicle_id", required=True)
-    parser.add_argument("--sim_type", choices=["metadrive"], required=True)
+    parser.add_argument("--sim_type", choices=["metadrive"], default="metadrive")
     parser.add_argument("--broadcast_port", type=int, default=5000)
-    parser.add_argument("--v2v_config", required=True, help="Path to v2v_settings.yaml")
+    parser.add_argument("--v2v_config", default="config/v2v_settings.yaml", help="Path to v2v_settings.yaml")
     parser.add_argument("--interval", type=float, default=1.0)
     args = parser.parse_args()
 
     v2v_config = load_config(args.v2v_config)
+    configure_logging(v2v_config)
+    metrics.configure_metrics(v2v_config)
 
     b = Broadcaster(
         vehicle_id=args.vehicle_id,
@@ -91,78 +137,6 @@ def main():
         v2v_config=v2v_config
     )
     b.broadcast(interval=args.interval)
-=======
-import argparse
-import socket
-import time
-import json
-import yaml
-import os
-import sys
-
-# Add project root to sys.path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from communication.encryption import EncryptionManager
-
-
-def load_config(path):
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return yaml.safe_load(f)
-    return {}
-
-
-class Broadcaster:
-    def __init__(self, vehicle_id, sim_type, broadcast_port, v2v_config_path, interval=1.0):
-        self.vehicle_id = vehicle_id
-        self.sim_type = sim_type
-        self.broadcast_port = broadcast_port
-        self.interval = interval
-
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-
-        # Load encryption
-        self.v2v_config = load_config(v2v_config_path)
-        self.encryption = EncryptionManager(self.v2v_config)
-
-        print(f"[BROADCASTER] Vehicle {self.vehicle_id} broadcasting on port {self.broadcast_port}")
-
-    def broadcast_loop(self):
-        while True:
-            # Example message
-            msg = {
-                "vehicle_id": self.vehicle_id,
-                "timestamp": time.time(),
-                "state": {
-                    "x": 10.0,
-                    "y": 5.0,
-                    "speed": 12.3
-                }
-            }
-
-            raw = json.dumps(msg).encode("utf-8")
-            payload = self.encryption.encrypt(raw)
-
-            self.sock.sendto(payload, ("255.255.255.255", self.broadcast_port))
-            print(f"[BROADCASTER] {self.vehicle_id} sent -> {msg}")
-
-            time.sleep(self.interval)
-
-
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--vehicle_id", required=True)
-    parser.add_argument("--sim_type", choices=["metadrive"], default="metadrive")
-    parser.add_argument("--broadcast_port", type=int, default=5000)
-    parser.add_argument("--v2v_config", default="config/v2v_settings.yaml")
-    parser.add_argument("--interval", type=float, default=1.0)
-    args = parser.parse_args()
-
-    bc = Broadcaster(args.vehicle_id, args.sim_type, args.broadcast_port, args.v2v_config, args.interval)
-    bc.broadcast_loop()
->>>>>>> a9f887ea93ec4d42118abb2e421d0eee9896e8c2
 
 
 if __name__ == "__main__":
@@ -5,6 +5,10 @@ import os
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad, unpad
 
+from telemetry.log import get_logger
+
+logger = get_logger("encryption")
+
 
 class EncryptionManager:
     def __init__(self, config: dict):
@@ -26,10 +30,10 @@ class EncryptionManager:
             if len(self.key) not in [16, 24, 32]:
                 raise ValueError("[ENCRYPTION] AES key length must be 16, 24, or 32 bytes.")
 
-            print(f"[ENCRYPTION] AES key loaded successfully ({len(self.key) * 8}-bit).")
+            logger.info("[ENCRYPTION] AES key loaded successfully (%d-bit).", len(self.key) * 8)
         else:
             self.key = None
-            print("[ENCRYPTION] Disabled in configuration.")
+            logger.info("[ENCRYPTION] Disabled in configuration.")
 
     def encrypt(self, data: bytes) -> bytes:
         if not self.enabled:
@@ -47,7 +51,6 @@ class EncryptionManager:
         if not self.enabled:
             return data
 
-        iv = data[:16]
-        encrypted_data = data[16:]
-        cipher = AES.new(self.key, AES.MODE_CBC, iv)
-        return unpad(cipher.decrypt(encrypted_data), AES.block_size)
+        view = memoryview(data)  # slicing a view does not copy the ciphertext
+        cipher = AES.new(self.key, AES.MODE_CBC, view[:16])
+        return unpad(cipher.decrypt(view[16:]), AES.block_size)
@@ -0,0 +1,205 @@
+# communication/fragmentation.py
+"""
+Fragmentation and reassembly of V2V messages larger than one datagram.
+
+The broadcaster splits an (encrypted) message longer than `mtu` bytes
+into `count` fragments, each prefixed with:
+
+    magic "V2VF" | message id u64 | index u16 | count u16 | total length u32
+
+(network byte order, 20 bytes). Fragment i carries bytes
+[i * chunk, (i + 1) * chunk) of the message, chunk = ceil(total / count),
+so the receiver can place any fragment without the others. Messages
+that fit in one datagram are sent as-is with no header, so small
+messages cost nothing extra. The message id is a random per-sender
+prefix plus a counter, so ids from different senders do not collide.
+
+The Reassembler allocates one buffer of the announced length on the
+first fragment of a message and copies every later fragment straight
+into place. Incomplete messages are dropped after `timeout` seconds,
+and the oldest ones are evicted when buffered bytes would exceed
+`max_bytes`.
+"""
+
+import math
+import os
+import struct
+import time
+from collections import OrderedDict
+
+from telemetry import metrics
+
+MAGIC = b"V2VF"
+HEADER = struct.Struct("!4sQHHI")
+MAX_FRAGMENTS = 0xFFFF
+
+# Completed message ids remembered for duplicate detection
+_DONE_HISTORY = 1024
+
+
+class Fragmenter:
+    def __init__(self, mtu=1400):
+        """
+        :param mtu: largest datagram this layer may produce (bytes, header included)
+        """
+        if mtu <= HEADER.size:
+            raise ValueError(f"[FRAGMENT] MTU must exceed the {HEADER.size}-byte fragment header.")
+        self.mtu = int(mtu)
+        self._id_prefix = int.from_bytes(os.urandom(4), "big") << 32
+        self._counter = 0
+
+    def fragment(self, data):
+        """
+        Split `data` into datagrams of at most `mtu` bytes.
+        :return: [data] unchanged if it fits, else the list of fragments
+        """
+        total = len(data)
+        if total <= self.mtu:
+            return [data]
+
+        count = math.ceil(total / (self.mtu - HEADER.size))
+        if count > MAX_FRAGMENTS:
+            raise ValueError(f"[FRAGMENT] Message of {total} bytes needs more than {MAX_FRAGMENTS} fragments.")
+        chunk = math.ceil(total / count)
+
+        self._counter = (self._counter + 1) & 0xFFFFFFFF
+        message_id = self._id_prefix | self._counter
+        view = memoryview(data)
+        return [HEADER.pack(MAGIC, message_id, i, count, total) + view[i * chunk:(i + 1) * chunk]
+                for i in range(count)]
+
+
+class _Partial:
+    __slots__ = ("buffer", "received", "remaining", "chunk", "first_seen")
+
+    def __init__(self, total, count, now):
+        self.buffer = bytearray(total)
+        self.received = bytearray(count)
+        self.remaining = count
+        self.chunk = math.ceil(total / count)
+        self.first_seen = now
+
+
+class Reassembler:
+    def __init__(self, timeout=1.0, max_bytes=16 * 1024 * 1024, max_message=4 * 1024 * 1024):
+        """
+        :param timeout: drop a message whose fragments have not all arrived within this (seconds)
+        :param max_bytes: cap on bytes held in incomplete messages; oldest are evicted first
+        :param max_message: largest message accepted (announced length, bytes)
+        """
+        self.timeout = float(timeout)
+        self.max_bytes = int(max_bytes)
+        self.max_message = min(int(max_message), self.max_bytes)
+        self._partials = OrderedDict()  # message id -> _Partial, oldest first
+        self._buffered = 0
+        self._done = OrderedDict()      # recently completed ids, so late duplicates are not restarted
+
+        self.completed = 0
+        self.expired = 0
+        self.evicted = 0
+        self.duplicates = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from the `communication` section of v2v_settings.yaml."""
+        section = (config or {}).get("communication", {}) or {}
+        return cls(timeout=section.get("reassembly_timeout", 1.0),
+                   max_bytes=section.get("reassembly_max_bytes", 16 * 1024 * 1024),
+                   max_message=section.get("max_message_size", 4 * 1024 * 1024))
+
+    def __len__(self):
+        return len(self._partials)
+
+    @property
+    def buffered_bytes(self):
+        return self._buffered
+
+    def feed(self, data, now=None):
+        """
+        Take one datagram.
+        :return: the complete message (`data` itself when it was not fragmented),
+                 or None while fragments are still missing or the datagram was dropped
+        """
+        if len(data) < HEADER.size or data[:4] != MAGIC:
+            return data  # unfragmented: zero-copy fast path
+
+        if now is None:
+            now = time.monotonic()
+        self.expire(now)
+
+        _, message_id, index, count, total = HEADER.unpack_from(data)
+        partial = self._partials.get(message_id)
+        if partial is None:
+            if message_id in self._done:
+                self.duplicates += 1
+                return None
+            if not 0 < total <= self.max_message or not 0 < count <= total or index >= count:
+                self._reject()
+                return None
+            self._make_room(total)
+            partial = self._partials[message_id] = _Partial(total, count, now)
+            self._buffered += total
+        elif index >= len(partial.received) or count != len(partial.received):
+            self._reject()
+            return None
+
+        if partial.received[index]:
+            self.duplicates += 1
+            return None
+
+        start = index * partial.chunk
+        end = min(start + partial.chunk, len(partial.buffer))
+        body = memoryview(data)[HEADER.size:]
+        if len(body) != end - start:
+            self._reject()
+            return None
+        partial.buffer[start:end] = body
+        partial.received[index] = 1
+        partial.remaining -= 1
+        if partial.remaining:
+            return None
+
+        del self._partials[message_id]
+        self._buffered -= len(partial.buffer)
+        self._done[message_id] = None
+        if len(self._done) > _DONE_HISTORY:
+            self._done.popitem(last=False)
+        self.completed += 1
+        metrics.inc("v2v_reassembled_total")
+        return partial.buffer
+
+    def expire(self, now=None):
+        """Drop incomplete messages older than `timeout`; returns how many were dropped."""
+        if now is None:
+            now = time.monotonic()
+        dropped = 0
+        cutoff = now - self.timeout
+        while self._partials:
+            message_id, partial = next(iter(self._partials.items()))
+            if partial.first_seen > cutoff:
+                break
+            self._drop(message_id)
+            dropped += 1
+        if dropped:
+            self.expired += dropped
+            metrics.inc("v2v_reassembly_expired_total", dropped)
+        return dropped
+
+    def clear(self):
+        self._partials.clear()
+        self._done.clear()
+        self._buffered = 0
+
+    def _make_room(self, total):
+        while self._partials and self._buffered + total > self.max_bytes:
+            self._drop(next(iter(self._partials)))
+            self.evicted += 1
+            metrics.inc("v2v_reassembly_evicted_total")
+
+    def _drop(self, message_id):
+        self._buffered -= len(self._partials.pop(message_id).buffer)
+
+    def _reject(self):
+        self.rejected += 1
+        metrics.inc("v2v_reassembly_rejected_total")
@@ -0,0 +1,249 @@
+# communication/geocast.py
+"""
+Range-filtered delivery for V2V messages.
+
+Broadcast makes every receiver decrypt and decode every message in the
+fleet. Geocast splits the plane into square cells of `cell_size` meters:
+
+  - each cell maps to an IPv4 multicast group in a /16 block; a sender transmits to the
+    group of its own cell, a receiver joins the groups of its own cell
+    and the cells within `range_cells` of it,
+  - every datagram starts with a small cleartext header carrying the
+    sender's cell, so a receiver can drop out-of-range senders (shared
+    groups of distant cells, stale memberships, broadcast fallback) before
+    paying for decryption.
+
+Header layout (network byte order, 12 bytes):
+
+    magic "V2VG" | version u8 | flags u8 | cell_x i16 | cell_y i16 | reserved u16
+
+Datagrams without the magic are passed through unfiltered, so geocast
+senders and plain broadcasters can share a port.
+
+SimulatedChannel runs the same group logic in-process, with radio range
+and random loss, for benchmarks and tests without sockets.
+"""
+
+import math
+import random
+import socket
+import struct
+
+from telemetry import metrics
+
+MAGIC = b"V2VG"
+VERSION = 1
+HEADER = struct.Struct("!4sBBhhH")
+
+# Cell coordinates wrap into the i16 header fields.
+_CELL_MOD = 1 << 16
+
+
+def _wrap_cell(c):
+    return (c + 0x8000) % _CELL_MOD - 0x8000
+
+
+def pack_header(cell, flags=0):
+    return HEADER.pack(MAGIC, VERSION, flags, _wrap_cell(cell[0]), _wrap_cell(cell[1]), 0)
+
+
+def parse_header(data):
+    """
+    Split a datagram into (cell, flags, payload).
+    :return: cell is None (and payload is `data`) for datagrams without a geocast header
+    """
+    if len(data) < HEADER.size or data[:4] != MAGIC:
+        return None, 0, data
+    _, version, flags, cx, cy, _ = HEADER.unpack_from(data)
+    if version != VERSION:
+        return None, 0, data
+    return (cx, cy), flags, data[HEADER.size:]
+
+
+class Geocast:
+    def __init__(self, cell_size=100.0, range_cells=1, group_base="239.192.0.0", enabled=True):
+        """
+        :param cell_size: side of a square cell (meters); should be at least the radio range
+        :param range_cells: accept senders up to this many cells away (Chebyshev), 1 = own + 8 neighbours
+        :param group_base: first address of the /16 multicast block cells map into
+        :param enabled: False keeps the header-free broadcast behaviour
+        """
+        self.cell_size = float(cell_size)
+        self.range_cells = int(range_cells)
+        self.enabled = enabled
+        self._group_base = struct.unpack("!I", socket.inet_aton(group_base))[0] & 0xFFFF0000
+
+        self.accepted = 0
+        self.filtered = 0
+        self.unfiltered = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from the `geocast` section of v2v_settings.yaml."""
+        section = (config or {}).get("geocast", {}) or {}
+        return cls(cell_size=section.get("cell_size", 100.0),
+                   range_cells=section.get("range_cells", 1),
+                   group_base=section.get("group_base", "239.192.0.0"),
+                   enabled=section.get("enabled", False))
+
+    @property
+    def overhead(self):
+        """Bytes wrap() adds to every datagram."""
+        return HEADER.size if self.enabled else 0
+
+    def cell_of(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def neighbourhood(self, cell):
+        """Cells whose senders a receiver in `cell` listens to, own cell first."""
+        r = self.range_cells
+        cells = [cell]
+        cells.extend((cell[0] + dx, cell[1] + dy)
+                     for dx in range(-r, r + 1) for dy in range(-r, r + 1) if dx or dy)
+        return cells
+
+    def group_for(self, cell):
+        """
+        Multicast group address of a cell: the low two octets are the cell
+        coordinates mod 256, so groups are unique within any 256 x 256 cell
+        window and cells further apart that share a group are caught by the
+        header filter.
+        """
+        h = ((cell[0] & 0xFF) << 8) | (cell[1] & 0xFF)
+        return socket.inet_ntoa(struct.pack("!I", self._group_base | h))
+
+    def groups_for(self, x, y):
+        """Distinct groups a receiver at (x, y) should be a member of."""
+        return list(dict.fromkeys(self.group_for(c) for c in self.neighbourhood(self.cell_of(x, y))))
+
+    def in_range(self, sender_cell, own_cell):
+        r = self.range_cells
+        return (abs(_wrap_cell(sender_cell[0] - own_cell[0])) <= r
+                and abs(_wrap_cell(sender_cell[1] - own_cell[1])) <= r)
+
+    def wrap(self, payload, x, y, flags=0):
+        """Prefix an (encrypted) payload with the sender's cell."""
+        if not self.enabled:
+            return payload
+        return pack_header(self.cell_of(x, y), flags) + payload
+
+    def accept(self, data, own_cell):
+        """
+        Header check run before decryption: False if the sender's cell is out
+        of range of `own_cell`. Datagrams without a header are always accepted.
+        """
+        cell, _, _ = parse_header(data)
+        if cell is None:
+            self.unfiltered += 1
+            return True
+        if own_cell is not None and not self.in_range(cell, own_cell):
+            self.filtered += 1
+            metrics.inc("v2v_geocast_filtered_total")
+            return False
+        self.accepted += 1
+        return True
+
+
+class MulticastMembership:
+    """Keeps a UDP socket joined to exactly the groups of the receiver's neighbourhood."""
+
+    def __init__(self, sock, interface="0.0.0.0"):
+        self.sock = sock
+        self.interface = socket.inet_aton(interface)
+        self.groups = set()
+
+    def update(self, groups):
+        """Join new groups and leave ones no longer wanted; returns (joined, left)."""
+        wanted = set(groups)
+        joined, left = wanted - self.groups, self.groups - wanted
+        for group in left:
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_DROP_MEMBERSHIP,
+                                 socket.inet_aton(group) + self.interface)
+        for group in joined:
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                                 socket.inet_aton(group) + self.interface)
+        self.groups = wanted
+        return joined, left
+
+
+class SimulatedChannel:
+    """
+    In-process stand-in for the radio: a datagram reaches every attached
+    vehicle subscribed to the sender's cell group (or every vehicle with
+    broadcast delivery) that is within `radio_range` meters, minus random
+    loss. Received datagrams queue in per-vehicle inboxes.
+    """
+
+    def __init__(self, geocast, radio_range=150.0, loss=0.0, seed=None, multicast=None):
+        """
+        :param geocast: Geocast instance used for cells and groups
+        :param radio_range: maximum sender-receiver distance (meters, None = unlimited)
+        :param loss: independent per-delivery drop probability
+        :param multicast: deliver by cell group (default: geocast.enabled); False = broadcast
+        """
+        self.geocast = geocast
+        self.multicast = geocast.enabled if multicast is None else multicast
+        self.radio_range = radio_range
+        self.loss = loss
+        self._rng = random.Random(seed)
+        self._positions = {}
+        self._inboxes = {}
+        self._members = {}      # group -> set of vehicle ids
+        self._groups = {}       # vehicle id -> groups it is a member of
+
+        self.sent = 0
+        self.delivered = 0
+        self.lost = 0
+        self.out_of_range = 0
+
+    def attach(self, vehicle_id, x, y):
+        self._inboxes.setdefault(vehicle_id, [])
+        self.move(vehicle_id, x, y)
+
+    def move(self, vehicle_id, x, y):
+        """Update a vehicle's position and its group memberships."""
+        self._positions[vehicle_id] = (x, y)
+        if not self.multicast:
+            return
+        for group in self._groups.get(vehicle_id, ()):
+            self._members[group].discard(vehicle_id)
+        groups = self.geocast.groups_for(x, y)
+        for group in groups:
+            self._members.setdefault(group, set()).add(vehicle_id)
+        self._groups[vehicle_id] = groups
+
+    def position(self, vehicle_id):
+        return self._positions[vehicle_id]
+
+    def send(self, sender_id, data):
+        """Deliver `data` from `sender_id`; returns the number of inboxes it reached."""
+        self.sent += 1
+        sx, sy = self._positions[sender_id]
+        if self.multicast:
+            group = self.geocast.group_for(self.geocast.cell_of(sx, sy))
+            candidates = self._members.get(group, ())
+        else:
+            candidates = self._inboxes
+
+        r2 = self.radio_range * self.radio_range if self.radio_range is not None else None
+        reached = 0
+        for vid in candidates:
+            if vid == sender_id:
+                continue
+            rx, ry = self._positions[vid]
+            if r2 is not None and (rx - sx) ** 2 + (ry - sy) ** 2 > r2:
+                self.out_of_range += 1
+                continue
+            if self.loss and self._rng.random() < self.loss:
+                self.lost += 1
+                continue
+            self._inboxes[vid].append(data)
+            reached += 1
+        self.delivered += reached
+        return reached
+
+    def receive(self, vehicle_id):
+        """Take every datagram waiting for `vehicle_id`."""
+        inbox = self._inboxes[vehicle_id]
+        self._inboxes[vehicle_id] = []
+        return inbox
@@ -1,11 +1,24 @@
 # communication/message_format.py
 import json
+import struct
 
+# Cleartext sequence header the broadcaster puts in front of the (encrypted)
+# message, so receivers can drop duplicate, reordered and stale messages
+# before decrypting them. Network byte order, 21 bytes + the vehicle id:
+#     magic "V2VS" | seq u64 | timestamp f64 | id length u8 | vehicle id (utf-8)
+SEQ_MAGIC = b"V2VS"
+SEQ_HEADER = struct.Struct("!4sQdB")
 
-def encode_message(vehicle_id, vehicle_pos, current_speed, obstacles):
+
+def encode_message(vehicle_id, vehicle_pos, current_speed, obstacles, seq=None, timestamp=None,
+                   velocity=None):
     """
     Create a JSON-encoded V2V message.
     Always sends obstacles as a list (even if empty or one).
+    `seq` (per-sender, increasing) and `timestamp` (sender wall clock, seconds)
+    let receivers drop duplicate, reordered and stale messages; both are
+    omitted when None so older receivers see the same fields as before.
+    `velocity` is the sender's [vx, vy] in m/s, used for time-to-collision.
     """
     message = {
         "vehicle_id": vehicle_id,
@@ -13,11 +26,53 @@ def encode_message(vehicle_id, vehicle_pos, current_speed, obstacles):
         "current_speed": current_speed,
         "obstacles": obstacles or []
     }
+    if seq is not None:
+        message["seq"] = seq
+    if timestamp is not None:
+        message["timestamp"] = timestamp
+    if velocity is not None:
+        message["velocity"] = velocity
     return json.dumps(message).encode("utf-8")
 
 
+def pack_seq_header(vehicle_id, seq, timestamp):
+    """Sequence header for one message; prefix it to the encrypted payload."""
+    sender = str(vehicle_id).encode("utf-8")
+    if len(sender) > 0xFF:
+        raise ValueError("[MESSAGE] vehicle_id is longer than 255 bytes.")
+    return SEQ_HEADER.pack(SEQ_MAGIC, seq, timestamp, len(sender)) + sender
+
+
+def parse_seq_header(data):
+    """
+    Split a message into (sender, seq, timestamp, payload) without copying
+    the payload (it is a memoryview when a header was present).
+    :return: sender is None (and payload is `data`) for messages without a sequence header
+    """
+    if len(data) < SEQ_HEADER.size or data[:4] != SEQ_MAGIC:
+        return None, None, None, data
+    _, seq, timestamp, length = SEQ_HEADER.unpack_from(data)
+    end = SEQ_HEADER.size + length
+    if len(data) < end:
+        return None, None, None, data
+    view = memoryview(data)
+    return str(view[SEQ_HEADER.size:end], "utf-8"), seq, timestamp, view[end:]
+
+
+def unpack_position(pos):
+    """
+    Return (x, y) from either {"x": .., "y": ..} or a [x, y] sequence.
+    The broadcaster sends dicts; older senders used lists. Also used for
+    the [vx, vy] velocity field.
+    """
+    if isinstance(pos, dict):
+        return pos.get("x", 0.0), pos.get("y", 0.0)
+    return pos[0], pos[1]
+
+
 def decode_message(data: bytes):
     """
     Decode JSON-encoded message back into Python dict.
+    Accepts bytes, bytearray or memoryview.
     """
-    return json.loads(data.decode("utf-8"))
+    return json.loads(str(data, "utf-8"))
@@ -0,0 +1,130 @@
+# communication/message_queue.py
+"""
+Staleness-aware receive queue: keeps only the newest message per sender.
+
+The receiver reads every datagram that is waiting on the socket, offers
+each decoded message here, then plans once per sender on drain(). So if
+decisions fall behind, old states from a sender are replaced by newer
+ones instead of being worked through in arrival order.
+
+check() and offer() reject (a couple of dict lookups each):
+  - duplicates / out-of-order datagrams: `seq` not above the last one
+    accepted from that sender (a lower `seq` with a newer `timestamp`
+    is a restarted sender and is accepted),
+  - stale messages: older than `max_age` seconds by their `timestamp`.
+Messages without `seq`/`timestamp` (older senders) skip those checks.
+
+The broadcaster also sends vehicle id, `seq` and `timestamp` in a
+cleartext header (message_format.pack_seq_header), so the receiver runs
+check() on them before decrypting: a duplicate, reordered or stale
+message costs a header parse instead of a decrypt + JSON decode. offer()
+repeats the checks on the decoded message and records it. This is about
+cost, not security: neither the header nor the AES-CBC payload is
+authenticated.
+"""
+
+import time
+
+from telemetry import metrics
+
+
+class LatestMessageQueue:
+    def __init__(self, max_age=0.5):
+        """
+        :param max_age: drop messages whose sender timestamp is older than this (seconds, 0 = never)
+        """
+        self.max_age = float(max_age)
+        self._pending = {}      # sender -> (message, recv_time)
+        self._last = {}         # sender -> (seq, timestamp) of the last accepted message
+
+        self.accepted = 0
+        self.duplicates = 0
+        self.out_of_order = 0
+        self.stale = 0
+        self.coalesced = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from the `communication` section of v2v_settings.yaml."""
+        section = (config or {}).get("communication", {}) or {}
+        return cls(max_age=section.get("max_message_age", 0.5))
+
+    def __len__(self):
+        return len(self._pending)
+
+    def check(self, sender, seq, timestamp, recv_time=None):
+        """
+        Would a message with these fields be accepted? Used on the cleartext
+        sequence header before decrypting. Rejections are counted; nothing
+        is queued or remembered.
+        :return: False for a duplicate, out-of-order or stale message
+        """
+        if recv_time is None:
+            recv_time = time.time()
+        last = self._last.get(sender)
+        if last is not None and seq is not None and last[0] is not None and seq <= last[0]:
+            restarted = timestamp is not None and last[1] is not None and timestamp > last[1]
+            if not restarted:
+                if seq == last[0]:
+                    self.duplicates += 1
+                    metrics.inc("v2v_queue_duplicates_total")
+                else:
+                    self.out_of_order += 1
+                    metrics.inc("v2v_queue_out_of_order_total")
+                return False
+
+        if timestamp is not None and self.max_age and recv_time - timestamp > self.max_age:
+            self.stale += 1
+            metrics.inc("v2v_queue_stale_total")
+            return False
+        return True
+
+    def offer(self, message, recv_time=None):
+        """
+        Queue a decoded message unless it is a duplicate, out of order or stale.
+        :return: True if queued
+        """
+        if recv_time is None:
+            recv_time = time.time()
+        sender = message.get("vehicle_id")
+        seq = message.get("seq")
+        timestamp = message.get("timestamp")
+
+        if timestamp is not None:
+            metrics.observe("v2v_message_lag_seconds", max(recv_time - timestamp, 0.0))
+        if not self.check(sender, seq, timestamp, recv_time):
+            return False
+
+        self._last[sender] = (seq, timestamp)
+        if sender in self._pending:
+            self.coalesced += 1
+            metrics.inc("v2v_queue_coalesced_total")
+        self._pending[sender] = (message, recv_time)
+        self.accepted += 1
+        return True
+
+    def drain(self, now=None):
+        """
+        Pop the newest pending message of every sender, dropping any that
+        went stale while queued.
+        :return: list of messages
+        """
+        if now is None:
+            now = time.time()
+        pending, self._pending = self._pending, {}
+        metrics.set_gauge("v2v_queue_senders", len(pending))
+
+        out = []
+        for message, _ in pending.values():
+            timestamp = message.get("timestamp")
+            if self.max_age and timestamp is not None and now - timestamp > self.max_age:
+                self.stale += 1
+                metrics.inc("v2v_queue_stale_total")
+                continue
+            out.append(message)
+        return out
+
+    def forget(self, sender):
+        """Drop all state for a sender (e.g. it left the area)."""
+        self._pending.pop(sender, None)
+        self._last.pop(sender, None)
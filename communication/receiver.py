@@ -1,5 +1,6 @@
 import socket
 import argparse
+import select
 import yaml
 import os
 import sys
@@ -8,10 +9,100 @@ import time
 # Add the parent directory to sys.path to resolve package imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# Correct import statement
-from encryption.encryption_utils import EncryptionManager
-from communication.message_format import decode_message
+from communication.encryption import EncryptionManager
+from communication.fragmentation import Reassembler
+from communication.geocast import Geocast, MulticastMembership, parse_header
+from communication.message_format import decode_message, parse_seq_header, unpack_position
+from communication.message_queue import LatestMessageQueue
+from communication.recorder import MessageRecorder
 from decision_engine.response_planner import ResponsePlanner
+from decision_engine.world_model import WorldModel
+from telemetry import metrics
+from telemetry.log import configure_logging, get_logger
+
+logger = get_logger("receiver")
+
+
+def decode_datagram(data, encryption):
+    """
+    Decrypt and decode one message (geocast header stripped, fragments
+    reassembled; a sequence header is skipped) into a message dict. Takes
+    bytes, a reassembly bytearray or a memoryview into a datagram or
+    capture file without copying it first.
+    """
+    data = parse_seq_header(data)[3]
+    if encryption.enabled:
+        with metrics.stage("decrypt"):
+            data = encryption.decrypt(data)
+
+    with metrics.stage("decode"):
+        return decode_message(data)
+
+
+def receive_message(data, encryption, queue, now=None):
+    """
+    Offer one reassembled message to `queue`. Its cleartext sequence header
+    (when present) is checked first, so duplicate, reordered and stale
+    messages are dropped without being decrypted or decoded.
+    :return: True if queued
+    """
+    sender, seq, timestamp, payload = parse_seq_header(data)
+    if sender is not None and not queue.check(sender, seq, timestamp, now):
+        return False
+    return queue.offer(decode_datagram(payload, encryption), now)
+
+
+def handle_message(message, planner, world=None, now=None):
+    """
+    Decide an action for one decoded message.
+    With a WorldModel, the message is fused into it and the planner sees the
+    deduplicated obstacles from all senders near the vehicle instead of
+    this message's list alone.
+    """
+    vehicle_pos = unpack_position(message.get("vehicle_pos", [0, 0]))
+    current_speed = message.get("current_speed", 0)
+    obstacles = message.get("obstacles", [])
+    velocity = message.get("velocity")
+    if velocity is not None:
+        velocity = unpack_position(velocity)
+
+    if world is not None:
+        world.update(message, now)
+        obstacles = world.query_radius(vehicle_pos[0], vehicle_pos[1], planner.perception_radius)
+        metrics.set_gauge("v2v_world_obstacles", len(world))
+
+    with metrics.stage("decide"):
+        return planner.decide_action(vehicle_pos, obstacles, current_speed, velocity,
+                                     sender=message.get("vehicle_id"))
+
+
+def process_datagram(data, encryption, planner, world=None, now=None):
+    """
+    Run one unfragmented raw datagram through decrypt -> decode -> plan.
+    Used by the benchmarks.
+    """
+    return handle_message(decode_datagram(parse_header(data)[2], encryption), planner, world, now)
+
+
+def read_pending(sock, first, limit, bufsize=4096):
+    """
+    Return `first` plus every datagram already waiting on `sock` (up to
+    `limit` in total) without blocking, so the queue can coalesce them.
+    Each read that returns a datagram is timed as the "recv" stage.
+    """
+    batch = [first]
+    timeout = sock.gettimeout()
+    sock.settimeout(0.0)
+    try:
+        while len(batch) < limit:
+            t0 = time.perf_counter()
+            batch.append(sock.recvfrom(bufsize)[0])
+            metrics.observe(metrics.STAGE_HISTOGRAM, time.perf_counter() - t0, stage="recv")
+    except OSError:
+        pass  # nothing more waiting (or a socket error, which the next blocking recvfrom reports)
+    finally:
+        sock.settimeout(timeout)
+    return batch
 
 
 def main():
@@ -21,52 +112,105 @@ def main():
     parser.add_argument("--listen_port", type=int, required=True, help="UDP port to listen on")
     parser.add_argument("--v2v_config", required=True, help="Path to v2v_settings.yaml")
     parser.add_argument("--thresholds", required=True, help="Path to thresholds.yaml")
+    parser.add_argument("--sim_params", default="config/sim_params.yaml",
+                        help="Path to sim_params.yaml (tick_rate sets the planning budget)")
+    parser.add_argument("--position", default="0,0",
+                        help="x,y of this vehicle for geocast group membership (placeholder until the simulator supplies it)")
+    parser.add_argument("--record", default=None,
+                        help="Append raw datagrams that pass the geocast filter to this capture file")
     args = parser.parse_args()
 
-    print(f"[RECEIVER] Vehicle {args.vehicle_id} listening on port {args.listen_port}")
-
     # Load V2V configuration
     with open(args.v2v_config, "r") as f:
         v2v_config = yaml.safe_load(f)
 
+    configure_logging(v2v_config)
+    metrics.configure_metrics(v2v_config)
+    logger.info("[RECEIVER] Vehicle %s listening on port %d", args.vehicle_id, args.listen_port)
+
     # Load thresholds configuration
     with open(args.thresholds, "r") as f:
         thresholds = yaml.safe_load(f)
 
     # Initialize encryption and planner
     encryption = EncryptionManager(v2v_config)
-    planner = ResponsePlanner(args.vehicle_id, config_path=args.thresholds)
+    planner = ResponsePlanner(args.vehicle_id, config_path=args.thresholds, sim_params_path=args.sim_params)
+    world = WorldModel.from_config(thresholds)
+    queue = LatestMessageQueue.from_config(v2v_config)
+    comm_config = v2v_config.get("communication", {}) or {}
+    max_batch = int(comm_config.get("max_batch", 256))
+    buffer_size = int(comm_config.get("buffer_size", 4096))
+    reassembler = Reassembler.from_config(v2v_config)
+    if buffer_size < int(comm_config.get("mtu", 1400)):
+        logger.warning("[RECEIVER] buffer_size %d is below the MTU; fragments will be truncated.", buffer_size)
 
     # Setup UDP socket
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.bind(("0.0.0.0", args.listen_port))
     sock.settimeout(1.0)
 
-    print(f"[RECEIVER] Started for {args.vehicle_id}")
+    # Geocast: join the multicast groups around this vehicle and drop
+    # out-of-range senders by header before decrypting.
+    geocast = Geocast.from_config(v2v_config)
+    own_cell = None
+    if geocast.enabled:
+        x, y = (float(v) for v in args.position.split(","))
+        own_cell = geocast.cell_of(x, y)
+        membership = MulticastMembership(sock)
+        membership.update(geocast.groups_for(x, y))
+        logger.info("[RECEIVER] Geocast cell %s, joined %d groups", own_cell, len(membership.groups))
+
+    recorder = MessageRecorder(args.record) if args.record else None
+    if recorder:
+        logger.info("[RECEIVER] Recording datagrams to %s", args.record)
+
+    logger.info("[RECEIVER] Started for %s", args.vehicle_id)
 
     try:
         while True:
             try:
-                data, addr = sock.recvfrom(4096)
-                if encryption.enabled:
-                    data = encryption.decrypt(data)
-
-                message = decode_message(data)
-                vehicle_pos = message.get("vehicle_pos", [0, 0])
-                current_speed = message.get("current_speed", 0)
-                obstacles = message.get("obstacles", [])
-
-                action = planner.decide_action(vehicle_pos, obstacles, current_speed)
-
-                print(f"[RECEIVER] Action for {args.vehicle_id}: {action}")
-
+                # Wait for traffic outside the "recv" stage, so it times the read alone
+                if not select.select([sock], [], [], sock.gettimeout())[0]:
+                    continue
+                with metrics.stage("recv"):
+                    data, addr = sock.recvfrom(buffer_size)
             except socket.timeout:
                 continue
-            except Exception as e:
-                print(f"[RECEIVER] Error: {e}")
+            except OSError as e:
+                # e.g. ECONNREFUSED from an ICMP error or ENOBUFS; the socket is still usable
+                metrics.inc("v2v_receive_errors_total")
+                logger.warning("[RECEIVER] recvfrom failed: %s", e)
+                continue
+
+            now = time.time()
+            for data in read_pending(sock, data, max_batch, buffer_size):
+                metrics.inc("v2v_messages_received_total")
+                metrics.inc("v2v_bytes_received_total", len(data))
+                if not geocast.accept(data, own_cell):
+                    continue
+                if recorder:
+                    recorder.record(data, now)  # after the filter, so a replay sees what was processed
+                try:
+                    data = reassembler.feed(parse_header(memoryview(data))[2], now)
+                    if data is None:
+                        continue  # more fragments to come
+                    receive_message(data, encryption, queue, now)
+                except Exception as e:
+                    metrics.inc("v2v_receive_errors_total")
+                    logger.warning("[RECEIVER] Error: %s", e)
+
+            for message in queue.drain():
+                try:
+                    action = handle_message(message, planner, world, time.time())
+                    logger.info("[RECEIVER] Action for %s: %s", args.vehicle_id, action)
+                except Exception as e:
+                    metrics.inc("v2v_receive_errors_total")
+                    logger.warning("[RECEIVER] Error: %s", e)
     except KeyboardInterrupt:
-        print(f"[RECEIVER] Vehicle {args.vehicle_id} shutting down.")
+        logger.info("[RECEIVER] Vehicle %s shutting down.", args.vehicle_id)
     finally:
+        if recorder:
+            recorder.close()
         sock.close()
 
 
@@ -0,0 +1,140 @@
+# communication/recorder.py
+"""
+Append-only capture of raw V2V datagrams for offline replay.
+
+Log layout (little-endian):
+    file header : 8 bytes magic  b"V2VCAP01"
+    record      : float64 receive timestamp (time.time())
+                  uint32  payload length
+                  payload (exactly the bytes returned by recvfrom)
+
+The receiver records datagrams after its geocast filter, so a capture
+holds exactly the traffic its pipeline processed.
+
+Records are only ever appended, so a capture can be read while it is
+still being written and a crash mid-record just leaves a short tail,
+which MessageLog ignores.
+"""
+
+import mmap
+import os
+import struct
+import time
+
+LOG_MAGIC = b"V2VCAP01"
+RECORD_HEADER = struct.Struct("<dI")
+
+
+class MessageRecorder:
+    """Appends raw datagrams with receive timestamps to a capture file."""
+
+    def __init__(self, path, flush_every=64):
+        """
+        :param path: capture file (created if missing, appended to otherwise)
+        :param flush_every: flush to disk after this many records
+        """
+        self.path = path
+        self.flush_every = max(1, int(flush_every))
+        self._pending = 0
+        self.count = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(LOG_MAGIC)
+        else:
+            with open(path, "rb") as f:
+                if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+                    self._file.close()
+                    raise ValueError(f"[RECORDER] {path} is not a V2V capture file.")
+
+    def record(self, data: bytes, timestamp=None):
+        """Append one datagram. `timestamp` defaults to the current wall clock."""
+        if timestamp is None:
+            timestamp = time.time()
+        self._file.write(RECORD_HEADER.pack(timestamp, len(data)))
+        self._file.write(data)
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        self._pending = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MessageLog:
+    """
+    Read-only, memory-mapped view of a capture file.
+    Iterating yields (timestamp, payload) with payload as a memoryview
+    into the mapping, so no datagram is copied until the caller needs it.
+    Views remain readable after close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(LOG_MAGIC):
+            self._file.close()
+            raise ValueError(f"[RECORDER] {path} is too short to be a V2V capture file.")
+
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        if bytes(self._view[:len(LOG_MAGIC)]) != LOG_MAGIC:
+            self.close()
+            raise ValueError(f"[RECORDER] {path} is not a V2V capture file.")
+
+    def __iter__(self):
+        view = self._view
+        end = len(view)
+        offset = len(LOG_MAGIC)
+        header_size = RECORD_HEADER.size
+
+        while offset + header_size <= end:
+            timestamp, length = RECORD_HEADER.unpack_from(view, offset)
+            offset += header_size
+            if offset + length > end:
+                break  # truncated tail from an interrupted write
+            yield timestamp, view[offset:offset + length]
+            offset += length
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def close(self):
+        """
+        Unmap the capture. Payload views the caller still holds stay valid:
+        if any exist, the mapping is left for the garbage collector to free
+        once the last of them is gone.
+        """
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None
+        if getattr(self, "_mmap", None) is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # payload views still exported; freed with the last one
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,186 @@
+# communication/replay.py
+"""
+Replay a datagram capture (see communication/recorder.py) through the
+receiver pipeline (reassemble -> sequence check -> decrypt -> decode ->
+LatestMessageQueue -> ResponsePlanner) without sockets. Records written
+in one receive batch share a timestamp and are drained from the queue
+together, so duplicates, reordering and coalescing are handled exactly
+as they were live. The receiver records after its geocast filter, so
+out-of-range traffic it dropped is not in the capture either; queue and
+reassembly limits come from --v2v_config, as in the receiver.
+
+Examples:
+    python communication/replay.py --log logs/ego.v2vcap --speed 1     # real time
+    python communication/replay.py --log logs/ego.v2vcap --speed 10    # 10x
+    python communication/replay.py --log logs/ego.v2vcap --speed 0     # as fast as possible
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import yaml
+
+# Add the parent directory to sys.path to resolve package imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from communication.encryption import EncryptionManager
+from communication.fragmentation import Reassembler
+from communication.geocast import parse_header
+from communication.message_queue import LatestMessageQueue
+from communication.receiver import handle_message, receive_message
+from communication.recorder import MessageLog
+from decision_engine.response_planner import ResponsePlanner
+from decision_engine.world_model import WorldModel
+from telemetry import metrics
+from telemetry.log import configure_logging
+
+
+def replay(log, encryption, planner, speed=0.0, limit=None, world=None, queue=None, reassembler=None):
+    """
+    Feed every record of `log` through the receiver pipeline, as the live
+    loop runs it: datagrams are reassembled, checked against a
+    LatestMessageQueue by their sequence header, decoded and offered to it, and once per receive batch (records sharing one
+    capture timestamp) the queue is drained and each surviving message
+    planned. Capture timestamps stand in for the receive clock, so the
+    queue's age checks and the WorldModel's expiry behave exactly as they
+    did live regardless of playback speed.
+    :param speed: playback rate relative to capture time (1.0 = real time, 0 = unpaced)
+    :param limit: stop after this many datagrams
+    :param queue: LatestMessageQueue to use (default: a fresh one with default settings)
+    :param reassembler: Reassembler to use (default: a fresh one with default settings)
+    :return: dict with counters, wall time and the per-datagram and per-plan latency histograms
+    """
+    if queue is None:
+        queue = LatestMessageQueue()
+    if reassembler is None:
+        reassembler = Reassembler()
+    receive_latency = metrics.LatencyHistogram()   # reassemble + check + decrypt + decode + offer, per datagram
+    latency = metrics.LatencyHistogram()           # plan, per drained message
+    datagrams = processed = errors = payload_bytes = 0
+    first_ts = batch_ts = None
+    wall_start = time.perf_counter()
+
+    def flush(now):
+        nonlocal processed, errors
+        for message in queue.drain(now):
+            t0 = time.perf_counter()
+            try:
+                handle_message(message, planner, world, now)
+                processed += 1
+            except Exception:
+                errors += 1
+            latency.record(time.perf_counter() - t0)
+
+    for ts, payload in log:
+        if limit is not None and datagrams >= limit:
+            break
+        if batch_ts is not None and ts != batch_ts:
+            flush(batch_ts)
+        batch_ts = ts
+
+        if speed > 0:
+            if first_ts is None:
+                first_ts = ts
+            delay = wall_start + (ts - first_ts) / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        datagrams += 1
+        payload_bytes += len(payload)
+        t0 = time.perf_counter()
+        try:
+            message = reassembler.feed(parse_header(payload)[2], ts)
+            if message is not None:
+                receive_message(message, encryption, queue, ts)
+        except Exception:
+            errors += 1
+        receive_latency.record(time.perf_counter() - t0)
+
+    if batch_ts is not None:
+        flush(batch_ts)
+
+    return {
+        "datagrams": datagrams,
+        "processed": processed,
+        "errors": errors,
+        "dropped": {"duplicates": queue.duplicates, "out_of_order": queue.out_of_order,
+                    "stale": queue.stale, "coalesced": queue.coalesced},
+        "bytes": payload_bytes,
+        "wall_time": time.perf_counter() - wall_start,
+        "receive_latency": receive_latency,
+        "latency": latency,
+    }
+
+
+def print_report(result):
+    wall = max(result["wall_time"], 1e-9)
+    latency = result["latency"]
+    receive = result["receive_latency"]
+    total = result["datagrams"]
+    dropped = ", ".join(f"{n} {reason}" for reason, n in result["dropped"].items())
+
+    print(f"[REPLAY] {total} datagrams ({result['errors']} errors) in {wall:.3f}s, "
+          f"{result['processed']} messages planned")
+    print(f"[REPLAY] Dropped by queue: {dropped}")
+    print(f"[REPLAY] Throughput: {total / wall:,.0f} datagrams/s, "
+          f"{result['bytes'] / wall / 1e6:.2f} MB/s")
+    if receive.count:
+        print(f"[REPLAY] Receive mean={receive.mean() * 1e6:.1f}us "
+              f"p99<={receive.percentile(99) * 1e6:.0f}us max={receive.max * 1e6:.0f}us")
+    if latency.count:
+        print(f"[REPLAY] Plan latency mean={latency.mean() * 1e6:.1f}us "
+              f"p50<={latency.percentile(50) * 1e6:.0f}us "
+              f"p90<={latency.percentile(90) * 1e6:.0f}us "
+              f"p99<={latency.percentile(99) * 1e6:.0f}us "
+              f"max={latency.max * 1e6:.0f}us")
+        print(latency.format())
+
+    stages = result.get("stages") or {}
+    for name in metrics.STAGES:
+        series = f'{metrics.STAGE_HISTOGRAM}{{stage="{name}"}}'
+        if series in stages:
+            h = stages[series]
+            print(f"[REPLAY]   {name:<8s} n={h['count']:<8d} mean={h['mean'] * 1e6:8.1f}us "
+                  f"p99<={h['p99'] * 1e6:8.0f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="V2V capture replay")
+    parser.add_argument("--log", required=True, help="Capture file written by receiver.py --record")
+    parser.add_argument("--vehicle_id", default="replay", help="Vehicle ID for the planner")
+    parser.add_argument("--v2v_config", default="config/v2v_settings.yaml", help="Path to v2v_settings.yaml")
+    parser.add_argument("--thresholds", default="config/thresholds.yaml", help="Path to thresholds.yaml")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Playback rate: 1 = real time, N = N x faster, 0 = max speed")
+    parser.add_argument("--limit", type=int, default=None, help="Replay at most this many datagrams")
+    parser.add_argument("--stages", action="store_true", help="Also report per-stage latency (enables metrics)")
+    parser.add_argument("--metrics_out", default=None, help="Write a JSON metrics snapshot here after the run")
+    args = parser.parse_args()
+
+    with open(args.v2v_config, "r") as f:
+        v2v_config = yaml.safe_load(f)
+
+    configure_logging(v2v_config)
+    metrics.enable(args.stages or bool(args.metrics_out))
+
+    encryption = EncryptionManager(v2v_config)
+    planner = ResponsePlanner(args.vehicle_id, config_path=args.thresholds)
+    with open(args.thresholds, "r") as f:
+        world = WorldModel.from_config(yaml.safe_load(f))
+
+    with MessageLog(args.log) as log:
+        result = replay(log, encryption, planner, speed=args.speed, limit=args.limit, world=world,
+                        queue=LatestMessageQueue.from_config(v2v_config),
+                        reassembler=Reassembler.from_config(v2v_config))
+
+    if metrics.is_enabled():
+        result["stages"] = metrics.REGISTRY.snapshot()["histograms"]
+        if args.metrics_out:
+            metrics.write_snapshot(args.metrics_out)
+    print_report(result)
+
+
+if __name__ == "__main__":
+    main()
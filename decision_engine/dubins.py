@@ -0,0 +1,144 @@
+# decision_engine/dubins.py
+"""
+Dubins curves: shortest forward-only paths between two poses for a
+vehicle with a minimum turning radius.
+
+Each path is three segments drawn from L (left arc), S (straight) and
+R (right arc); the six candidate words are LSL, RSR, LSR, RSL, RLR, LRL
+(Shkel & Lumelsky, 2001). Used by HybridAStar for analytic expansion.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from decision_engine.motion_primitives import wrap_to_pi
+
+TWO_PI = 2.0 * math.pi
+
+
+def _mod2pi(a: float) -> float:
+    return a % TWO_PI
+
+
+@dataclass
+class DubinsPath:
+    start: Tuple[float, float, float]
+    word: str                    # e.g. "LSR"
+    lengths: Tuple[float, float, float]  # normalized segment lengths (multiply by radius)
+    radius: float
+
+    @property
+    def length(self) -> float:
+        return sum(self.lengths) * self.radius
+
+    def sample(self, step: float) -> List[Tuple[float, float, float]]:
+        """(x, y, theta) points every `step` meters along the path, endpoints included."""
+        x, y, th = self.start
+        points = [(x, y, th)]
+        rho = self.radius
+        carry = 0.0  # distance into the current segment where the next sample falls
+
+        for seg_type, seg_norm in zip(self.word, self.lengths):
+            seg_len = seg_norm * rho
+            s = step - carry
+            while s < seg_len - 1e-9:
+                points.append(_advance(x, y, th, seg_type, s, rho))
+                s += step
+            carry = seg_len - (s - step)
+            x, y, th = _advance(x, y, th, seg_type, seg_len, rho)
+
+        if math.hypot(points[-1][0] - x, points[-1][1] - y) > 1e-6:
+            points.append((x, y, th))
+        return points
+
+
+def _advance(x, y, th, seg_type, s, rho):
+    """Pose after moving `s` meters along a segment of the given type."""
+    if seg_type == "S":
+        return x + s * math.cos(th), y + s * math.sin(th), th
+    k = 1.0 if seg_type == "L" else -1.0
+    nth = th + k * s / rho
+    return (x + rho * k * (math.sin(nth) - math.sin(th)),
+            y - rho * k * (math.cos(nth) - math.cos(th)),
+            wrap_to_pi(nth))
+
+
+def _lsl(a, b, d, sa, sb, ca, cb, cab):
+    p2 = 2.0 + d * d - 2.0 * cab + 2.0 * d * (sa - sb)
+    if p2 < 0:
+        return None
+    tmp = math.atan2(cb - ca, d + sa - sb)
+    return _mod2pi(-a + tmp), math.sqrt(p2), _mod2pi(b - tmp)
+
+
+def _rsr(a, b, d, sa, sb, ca, cb, cab):
+    p2 = 2.0 + d * d - 2.0 * cab + 2.0 * d * (sb - sa)
+    if p2 < 0:
+        return None
+    tmp = math.atan2(ca - cb, d - sa + sb)
+    return _mod2pi(a - tmp), math.sqrt(p2), _mod2pi(-b + tmp)
+
+
+def _lsr(a, b, d, sa, sb, ca, cb, cab):
+    p2 = -2.0 + d * d + 2.0 * cab + 2.0 * d * (sa + sb)
+    if p2 < 0:
+        return None
+    p = math.sqrt(p2)
+    tmp = math.atan2(-ca - cb, d + sa + sb) - math.atan2(-2.0, p)
+    return _mod2pi(-a + tmp), p, _mod2pi(-b + tmp)
+
+
+def _rsl(a, b, d, sa, sb, ca, cb, cab):
+    p2 = -2.0 + d * d + 2.0 * cab - 2.0 * d * (sa + sb)
+    if p2 < 0:
+        return None
+    p = math.sqrt(p2)
+    tmp = math.atan2(ca + cb, d - sa - sb) - math.atan2(2.0, p)
+    return _mod2pi(a - tmp), p, _mod2pi(b - tmp)
+
+
+def _rlr(a, b, d, sa, sb, ca, cb, cab):
+    tmp = (6.0 - d * d + 2.0 * cab + 2.0 * d * (sa - sb)) / 8.0
+    if abs(tmp) > 1.0:
+        return None
+    p = _mod2pi(TWO_PI - math.acos(tmp))
+    t = _mod2pi(a - math.atan2(ca - cb, d - sa + sb) + p / 2.0)
+    return t, p, _mod2pi(a - b - t + p)
+
+
+def _lrl(a, b, d, sa, sb, ca, cb, cab):
+    tmp = (6.0 - d * d + 2.0 * cab + 2.0 * d * (sb - sa)) / 8.0
+    if abs(tmp) > 1.0:
+        return None
+    p = _mod2pi(TWO_PI - math.acos(tmp))
+    t = _mod2pi(-a - math.atan2(ca - cb, d + sa - sb) + p / 2.0)
+    return t, p, _mod2pi(b - a - t + p)
+
+
+_WORDS = (("LSL", _lsl), ("RSR", _rsr), ("LSR", _lsr), ("RSL", _rsl), ("RLR", _rlr), ("LRL", _lrl))
+
+
+def dubins_paths(start, goal, radius):
+    """All feasible Dubins paths from `start` to `goal` ((x, y, theta) each), shortest first."""
+    dx, dy = goal[0] - start[0], goal[1] - start[1]
+    d = math.hypot(dx, dy) / radius
+    theta = math.atan2(dy, dx) if d > 1e-9 else 0.0
+    a = _mod2pi(start[2] - theta)
+    b = _mod2pi(goal[2] - theta)
+    sa, sb, ca, cb = math.sin(a), math.sin(b), math.cos(a), math.cos(b)
+    cab = math.cos(a - b)
+
+    paths = []
+    for word, solver in _WORDS:
+        lengths = solver(a, b, d, sa, sb, ca, cb, cab)
+        if lengths is not None:
+            paths.append(DubinsPath(tuple(start), word, lengths, radius))
+    paths.sort(key=lambda p: p.length)
+    return paths
+
+
+def shortest_path(start, goal, radius):
+    """Shortest Dubins path, or None if none exists (only for degenerate inputs)."""
+    paths = dubins_paths(start, goal, radius)
+    return paths[0] if paths else None
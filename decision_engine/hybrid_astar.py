@@ -2,64 +2,311 @@
 
 import math
 import heapq
+import time
+from collections import OrderedDict
+
+from decision_engine import path_smoothing
+from decision_engine.dubins import shortest_path
+from decision_engine.motion_primitives import wrap_to_pi
+from decision_engine.obstacle_index import ObstacleIndex
+from telemetry.log import get_logger
+
+logger = get_logger("hybrid_astar")
 
 
 class HybridAStar:
-    def __init__(self, step_size=2.0, max_steer=0.5, wheelbase=2.5):
+    def __init__(self, step_size=2.0, max_steer=0.5, wheelbase=2.5, clearance=2.0,
+                 analytic_interval=5, goal_tolerance=5.0, heading_bins=16,
+                 smooth=True, waypoint_spacing=1.0, max_saved_searches=32, finish_reserve=0.2):
         """
         Simple Hybrid A* Planner for car-like vehicles.
         :param step_size: forward step size (meters)
         :param max_steer: maximum steering angle (radians)
         :param wheelbase: vehicle wheelbase length (meters)
+        :param clearance: minimum distance kept from obstacle points (meters)
+        :param analytic_interval: try a Dubins shot to the goal every N expansions (0 = never)
+        :param goal_tolerance: accept a node this close to the goal if a straight leg to it is
+                               clear and needs no sharper heading change than the turning radius allows
+        :param heading_bins: heading discretization for the closed set
+        :param smooth: shortcut and smooth the raw path before resampling
+        :param waypoint_spacing: distance between output waypoints (meters)
+        :param max_saved_searches: unfinished searches kept for resuming; the least recently used is dropped
+        :param finish_reserve: share of deadline_ms kept for returning the path: shortcutting and
+                               smoothing stop this far before the deadline (so the final clearance
+                               check fits) and the search half as far
         """
         self.step_size = step_size
         self.max_steer = max_steer
         self.wheelbase = wheelbase
+        self.clearance = clearance
+        self.analytic_interval = analytic_interval
+        self.goal_tolerance = goal_tolerance
+        self.heading_bins = heading_bins
+        self.smooth = smooth
+        self.waypoint_spacing = waypoint_spacing
+        self.max_saved_searches = max_saved_searches
+        self.finish_reserve = finish_reserve
+        self.turning_radius = wheelbase / math.tan(max_steer)
+
+        # The search and Dubins checks test points every `check_step`, and
+        # the waypoint polyline cuts across arcs. Planning against a clearance
+        # inflated for both (half the sample gap, plus the chord sagittas)
+        # keeps the final waypoint segments at least `clearance` away.
+        self.check_step = min(0.5 * step_size, waypoint_spacing)
+        sagitta = (step_size ** 2 + waypoint_spacing ** 2) / (8.0 * self.turning_radius)
+        self.plan_clearance = math.hypot(clearance + sagitta, 0.5 * self.check_step)
+
+        # Filled by every plan() call: iterations, found, partial, analytic, resumed, ...
+        self.last_stats = {}
+
+        # Unfinished searches kept for plan(..., resume=True), by caller key
+        self._searches = OrderedDict()
 
-    def plan(self, start, goal, obstacles=None, max_iter=200):
+    def plan(self, start, goal, obstacles=None, max_iter=200, deadline_ms=None, resume=False,
+             key=None, max_total_iter=None):
         """
         Hybrid A* simplified path planner.
         :param start: (x, y) or (x, y, heading)
-        :param goal: {"x": gx, "y": gy}
+        :param goal: {"x": gx, "y": gy} with optional "theta" (final heading)
         :param obstacles: list of (ox, oy) obstacle points
-        :param max_iter: maximum iterations
-        :return: list of (x, y) waypoints
+        :param max_iter: maximum iterations for this call
+        :param deadline_ms: wall-clock budget for this call (None = no time limit)
+        :param resume: continue the unfinished search saved under `key` if it was
+                       for (about) the same goal and obstacles and started near `start`
+        :param key: names the saved search, e.g. the sender a reroute is for, so
+                    interleaved plans for different vehicles do not evict each other
+        :param max_total_iter: cap on iterations across resumes (None = no cap); when
+                               reached, the partial path is returned and the search dropped
+        :return: list of evenly spaced (x, y, theta) waypoints. If the budget runs
+                 out first, the path to the node closest to the goal so far
+                 (last_stats["found"] is False, last_stats["partial"] is True).
         """
-        sx, sy = start[0], start[1]
-        gx, gy = goal["x"], goal["y"]
+        t0 = time.perf_counter()
+        deadline = post_deadline = None
+        if deadline_ms is not None:
+            budget = deadline_ms / 1000.0
+            deadline = t0 + budget * (1.0 - 0.5 * self.finish_reserve)
+            post_deadline = t0 + budget * (1.0 - self.finish_reserve)
+
+        state = self._searches.pop(key, None) if resume else None
+        if state is None or not state.matches(start, goal, obstacles, self.step_size):
+            state = _SearchState(start, goal, obstacles, self.plan_clearance)
+
+        self.last_stats = {"iterations": 0, "total_iterations": state.iterations, "found": False,
+                           "partial": False, "analytic": False, "resumed": state.iterations > 0,
+                           "capped": False, "waypoints": 0, "elapsed_ms": 0.0}
+        if max_total_iter is not None:
+            max_iter = max(0, min(max_iter, max_total_iter - state.iterations))
+        path = self._run(state, max_iter, deadline, post_deadline)
+
+        if path is None:
+            path = self._partial(state)
+            if not state.open_list:
+                logger.warning("[HYBRID A*] Search space exhausted, returning partial path.")
+            elif max_total_iter is not None and state.iterations >= max_total_iter:
+                logger.debug("[HYBRID A*] Total budget of %d iterations reached, giving up.", max_total_iter)
+                self.last_stats["capped"] = True
+            else:
+                logger.debug("[HYBRID A*] Budget exhausted after %d iterations, returning partial path.",
+                             state.iterations)
+                self._save(key, state)
+
+        self.last_stats["total_iterations"] = state.iterations
+        self.last_stats["elapsed_ms"] = (time.perf_counter() - t0) * 1000.0
+        return path
 
-        start_node = (0, sx, sy, 0.0, [])  # (cost, x, y, heading, path)
-        open_list = []
-        heapq.heappush(open_list, start_node)
-        visited = set()
+    def reset(self, key=None):
+        """Forget the suspended search saved under `key`, or all of them when None."""
+        if key is None:
+            self._searches.clear()
+        else:
+            self._searches.pop(key, None)
 
-        for _ in range(max_iter):
-            cost, x, y, theta, path = heapq.heappop(open_list)
+    def _save(self, key, state):
+        self._searches[key] = state  # most recently used last
+        while len(self._searches) > self.max_saved_searches:
+            self._searches.popitem(last=False)
 
-            if (round(x), round(y)) in visited:
+    def _run(self, state, max_iter, deadline, post_deadline=None):
+        """
+        Expand nodes until the goal is reached or the budget runs out; None if it ran out.
+        A path found is post-processed until `post_deadline`.
+        """
+        gx, gy, gtheta = state.gx, state.gy, state.gtheta
+        index, nodes, open_list, visited = state.index, state.nodes, state.open_list, state.visited
+
+        interval = self.analytic_interval
+        for iteration in range(1, max_iter + 1):
+            if not open_list:
+                return None  # search space exhausted
+            if deadline is not None:
+                # Every 8 cheap expansions, and before every (costly) analytic one
+                n = state.iterations + 1
+                analytic_next = interval and (n == 1 or n % interval == 0)
+                if (analytic_next or iteration % 8 == 0) and time.perf_counter() >= deadline:
+                    return None
+            _, cost, node_id = heapq.heappop(open_list)
+            x, y, theta, _ = nodes[node_id]
+            state.iterations += 1
+            self.last_stats["iterations"] = iteration
+
+            key = self._key(x, y, theta)
+            if key in visited:
                 continue
-            visited.add((round(x), round(y)))
+            visited.add(key)
+
+            h = math.hypot(gx - x, gy - y)
+            if h < state.best_h:
+                state.best_h, state.best_id = h, node_id
 
-            # Goal check
-            if math.hypot(gx - x, gy - y) < 5.0:
-                return path + [(x, y), (gx, gy)]
+            # Analytic expansion: a collision-free Dubins curve straight to the goal
+            if interval and (state.iterations == 1 or state.iterations % interval == 0):
+                tail = self._analytic_expansion(x, y, theta, gx, gy, gtheta, index)
+                if tail is not None:
+                    self.last_stats["analytic"] = True
+                    return self._finish(nodes, node_id, tail, index, post_deadline)
 
-            # Expand neighbors
-            for delta in [-self.max_steer, 0, self.max_steer]:
-                nx = x + self.step_size * math.cos(theta)
-                ny = y + self.step_size * math.sin(theta)
-                ntheta = theta + (self.step_size / self.wheelbase) * math.tan(delta)
+            # Goal check: a short straight leg the vehicle can drive without turning hard
+            if h < self.goal_tolerance:
+                approach = math.atan2(gy - y, gx - x) if h > 1e-6 else theta
+                max_turn = min(self.waypoint_spacing, h) / self.turning_radius
+                if abs(wrap_to_pi(approach - theta)) <= max_turn and index.segment_free(x, y, gx, gy):
+                    return self._finish(nodes, node_id, [(gx, gy, approach)], index, post_deadline)
 
-                # Obstacle check
-                if obstacles:
-                    if any(math.hypot(nx - ox, ny - oy) < 2.0 for ox, oy in obstacles):
-                        continue  # skip if too close to obstacle
+            # Expand neighbors (bicycle model, midpoint heading)
+            for delta in (-self.max_steer, 0.0, self.max_steer):
+                dtheta = (self.step_size / self.wheelbase) * math.tan(delta)
+                mid = theta + 0.5 * dtheta
+                nx = x + self.step_size * math.cos(mid)
+                ny = y + self.step_size * math.sin(mid)
+                ntheta = wrap_to_pi(theta + dtheta)
+
+                # Obstacle check (arc midpoint too, so a step cannot hop over an obstacle)
+                half = 0.5 * self.step_size
+                if index.collides(nx, ny) or index.collides(x + half * math.cos(theta + 0.25 * dtheta),
+                                                            y + half * math.sin(theta + 0.25 * dtheta)):
+                    continue  # skip if too close to obstacle
 
                 g_cost = cost + self.step_size
                 h_cost = math.hypot(gx - nx, gy - ny)
-                f_cost = g_cost + h_cost
+                nodes.append((nx, ny, ntheta, node_id))
+                heapq.heappush(open_list, (g_cost + h_cost, g_cost, len(nodes) - 1))
+
+        return None
+
+    # -------------------- internals --------------------
+
+    def _key(self, x, y, theta):
+        bin_width = 2.0 * math.pi / self.heading_bins
+        return round(x), round(y), int(round(theta / bin_width)) % self.heading_bins
+
+    def _analytic_expansion(self, x, y, theta, gx, gy, gtheta, index):
+        """Sampled Dubins path from (x, y, theta) to the goal, or None if it hits an obstacle."""
+        if gtheta is None:
+            if math.hypot(gx - x, gy - y) < 1e-6:
+                return [(gx, gy, theta)]
+            gtheta = math.atan2(gy - y, gx - x)  # free final heading: aim along the approach
+        path = shortest_path((x, y, theta), (gx, gy, gtheta), self.turning_radius)
+        if path is None:
+            return None
+        samples = path.sample(self.check_step)
+        return samples if index.path_free(samples) else None
+
+    def _finish(self, nodes, node_id, tail, index, deadline=None):
+        """
+        Walk parents back to the start, append `tail` ((x, y, theta) poses), then
+        post-process within what is left of `deadline`; past it, the raw path is
+        only resampled.
+        """
+        raw = self._trace(nodes, node_id)
+        raw.extend(tail)  # duplicate joints are dropped by resample()
+
+        if self.smooth and (deadline is None or time.perf_counter() < deadline):
+            path = path_smoothing.postprocess(raw, index, self.waypoint_spacing, self.turning_radius,
+                                              clearance=self.clearance, check_step=self.check_step,
+                                              deadline=deadline)
+        else:
+            path = path_smoothing.resample(raw, self.waypoint_spacing)
+            path[0] = raw[0]  # keep the start heading
+        self.last_stats["found"] = True
+        self.last_stats["waypoints"] = len(path)
+        return path
+
+    def _partial(self, state):
+        """Best-effort path: start -> the node closest to the goal so far."""
+        raw = self._trace(state.nodes, state.best_id)
+
+        self.last_stats["partial"] = True
+        path = path_smoothing.resample(raw, self.waypoint_spacing)
+        path[0] = raw[0]  # keep the start heading
+        self.last_stats["waypoints"] = len(path)
+        return path
+
+    def _trace(self, nodes, node_id):
+        """
+        (x, y, theta) poses from the start node to `node_id`, with the midpoint
+        of every step's arc in between so the polyline follows the arcs.
+        """
+        raw = []
+        half = 0.5 * self.step_size
+        while node_id != -1:
+            x, y, theta, parent = nodes[node_id]
+            raw.append((x, y, theta))
+            if parent != -1:
+                px, py, ptheta, _ = nodes[parent]
+                mid = ptheta + 0.25 * wrap_to_pi(theta - ptheta)
+                raw.append((px + half * math.cos(mid), py + half * math.sin(mid),
+                            ptheta + 0.5 * wrap_to_pi(theta - ptheta)))
+            node_id = parent
+        raw.reverse()
+        return raw
+
+
+class _SearchState:
+    """Open/closed sets and node store of one (possibly suspended) search."""
+
+    def __init__(self, start, goal, obstacles, clearance):
+        sx, sy = start[0], start[1]
+        stheta = start[2] if len(start) > 2 else 0.0
+        self.gx, self.gy, self.gtheta = goal["x"], goal["y"], goal.get("theta")
+        self.start = (sx, sy)
+        self.quantum = max(clearance / 2.0, 1e-3)
+        self.signature = _obstacle_signature(obstacles, self.quantum)
+        self.index = ObstacleIndex(obstacles, clearance)
+
+        # Nodes live in a flat list; heap entries and parents refer to them by id.
+        self.nodes = [(sx, sy, stheta, -1)]  # (x, y, heading, parent id)
+        self.open_list = [(math.hypot(self.gx - sx, self.gy - sy), 0.0, 0)]  # (f, g, node id)
+        self.visited = set()
+        self.iterations = 0
+        self.best_id = 0
+        self.best_h = math.hypot(self.gx - sx, self.gy - sy)
+
+    def matches(self, start, goal, obstacles, tolerance):
+        """
+        Can a search for (start, goal, obstacles) pick up where this one stopped?
+        Goal and obstacles are compared on the `quantum` grid, since both come
+        from running-mean fused reports that jitter between ticks; a resumed
+        search keeps aiming at its original goal.
+        """
+        q = self.quantum
+        return (round(goal["x"] / q) == round(self.gx / q) and round(goal["y"] / q) == round(self.gy / q)
+                and _same_heading(goal.get("theta"), self.gtheta)
+                and math.hypot(start[0] - self.start[0], start[1] - self.start[1]) <= tolerance
+                and _obstacle_signature(obstacles, q) == self.signature)
+
+
+def _same_heading(a, b, tolerance=0.1):
+    if a is None or b is None:
+        return a is b
+    return abs(wrap_to_pi(a - b)) <= tolerance
 
-                heapq.heappush(open_list, (f_cost, nx, ny, ntheta, path + [(x, y)]))
 
-        print("[HYBRID A*] Failed to find path within iteration limit.")
-        return [(sx, sy), (gx, gy)]  # fallback straight path
+def _obstacle_signature(obstacles, quantum):
+    """
+    Order-independent fingerprint of the obstacle set on a `quantum` grid, so
+    the small position jitter of fused reports does not force a restart.
+    """
+    if not obstacles:
+        return 0
+    return hash(frozenset((round(o[0] / quantum), round(o[1] / quantum)) for o in obstacles))
@@ -0,0 +1,88 @@
+# decision_engine/obstacle_index.py
+"""
+Uniform-grid index over point obstacles for fast clearance checks.
+Cell size equals the clearance radius, so a point only has to be
+compared against obstacles in its own and the 8 neighbouring cells.
+"""
+
+import math
+
+
+class ObstacleIndex:
+    def __init__(self, obstacles=None, clearance=2.0):
+        """
+        :param obstacles: iterable of (x, y) obstacle points
+        :param clearance: minimum allowed distance to any obstacle (meters)
+        """
+        self.clearance = float(clearance)
+        self._cell_size = max(self.clearance, 1e-6)
+        self._c2 = self.clearance * self.clearance
+        self._grid = {}
+        self._count = 0
+        for ox, oy in obstacles or ():
+            self.add(ox, oy)
+
+    def __len__(self):
+        return self._count
+
+    def add(self, x, y):
+        cell = (math.floor(x / self._cell_size), math.floor(y / self._cell_size))
+        self._grid.setdefault(cell, []).append((x, y))
+        self._count += 1
+
+    def collides(self, x, y):
+        """True if (x, y) is closer than `clearance` to any obstacle."""
+        if not self._count:
+            return False
+        cx = math.floor(x / self._cell_size)
+        cy = math.floor(y / self._cell_size)
+        grid, c2 = self._grid, self._c2
+        for nx in (cx - 1, cx, cx + 1):
+            for ny in (cy - 1, cy, cy + 1):
+                for ox, oy in grid.get((nx, ny), ()):
+                    if (ox - x) ** 2 + (oy - y) ** 2 < c2:
+                        return True
+        return False
+
+    def path_free(self, points):
+        """True if no point of an (x, y, ...) sequence collides."""
+        collides = self.collides
+        return not any(collides(p[0], p[1]) for p in points)
+
+    def polyline_free(self, points, clearance=None):
+        """True if every segment of an (x, y, ...) polyline stays clear."""
+        if len(points) == 1:
+            return self.segment_free(points[0][0], points[0][1], points[0][0], points[0][1], clearance)
+        segment_free = self.segment_free
+        return all(segment_free(a[0], a[1], b[0], b[1], clearance) for a, b in zip(points, points[1:]))
+
+    def segment_free(self, x0, y0, x1, y1, clearance=None):
+        """
+        True if no point of the straight segment comes within `clearance`
+        (default: the index's, and never more) of an obstacle. Uses the exact
+        point-to-segment distance, not sampling; the segment is cut into
+        pieces no longer than a cell, so each piece only scans a few cells.
+        """
+        if not self._count:
+            return True
+        c = self.clearance if clearance is None else min(clearance, self.clearance)
+        n = max(1, int(math.ceil(math.hypot(x1 - x0, y1 - y0) / self._cell_size)))
+        dx, dy = (x1 - x0) / n, (y1 - y0) / n
+        for k in range(n):
+            if self._piece_hits(x0 + dx * k, y0 + dy * k, dx, dy, c):
+                return False
+        return True
+
+    def _piece_hits(self, ax, ay, dx, dy, c):
+        cs, c2, grid = self._cell_size, c * c, self._grid
+        bx, by = ax + dx, ay + dy
+        l2 = dx * dx + dy * dy
+        for cx in range(math.floor((min(ax, bx) - c) / cs), math.floor((max(ax, bx) + c) / cs) + 1):
+            for cy in range(math.floor((min(ay, by) - c) / cs), math.floor((max(ay, by) + c) / cs) + 1):
+                for ox, oy in grid.get((cx, cy), ()):
+                    t = ((ox - ax) * dx + (oy - ay) * dy) / l2 if l2 > 0.0 else 0.0
+                    t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+                    px, py = ax + t * dx - ox, ay + t * dy - oy
+                    if px * px + py * py < c2:
+                        return True
+        return False
@@ -0,0 +1,220 @@
+# decision_engine/path_smoothing.py
+"""
+Post-processing for Hybrid A* output: shortcutting, smoothing and
+resampling into evenly spaced (x, y, theta) waypoints, the format
+VehicleManager.follow_path consumes.
+
+Every step keeps the path drivable: shortcuts are Dubins curves between
+poses (start heading and turning radius respected), smoothing never
+moves the first or last two points, and every move is checked against
+the obstacle index segment by segment, not just point by point.
+"""
+
+import math
+import time
+
+from decision_engine.dubins import shortest_path
+
+
+def _expired(deadline):
+    return deadline is not None and time.perf_counter() >= deadline
+
+
+def shortcut(poses, index, turning_radius, step=1.0, deadline=None):
+    """
+    Drivable shortcutting: from each kept pose, jump to the farthest later
+    pose reachable by a collision-free Dubins path no longer than the
+    stretch of path it replaces, and splice that curve in. The farthest
+    pose is tried first, then a binary search, so a clear path costs one
+    Dubins check and the total stays O(n log n) checks.
+    :param poses: list of (x, y, theta)
+    :param turning_radius: minimum turning radius (meters)
+    :param step: sampling distance along the Dubins replacements; their
+                 points are checked with `index.path_free`, so the index
+                 clearance must allow for gaps of this size
+    :param deadline: time.perf_counter() value; once passed, no more
+                     replacements are tried and the remaining poses are kept
+    :return: list of (x, y, theta)
+    """
+    if len(poses) <= 2:
+        return list(poses)
+
+    travelled = [0.0]
+    for a, b in zip(poses, poses[1:]):
+        travelled.append(travelled[-1] + math.hypot(b[0] - a[0], b[1] - a[1]))
+
+    def replacement(i, j):
+        if _expired(deadline):
+            return None
+        path = shortest_path(poses[i], poses[j], turning_radius)
+        if path is None or path.length > travelled[j] - travelled[i] + 1e-6:
+            return None
+        samples = path.sample(step)
+        return samples if index.path_free(samples) else None
+
+    out = [poses[0]]
+    i = 0
+    last = len(poses) - 1
+    while i < last:
+        if _expired(deadline):
+            out.extend(poses[i + 1:])
+            break
+        best = None
+        if last - i > 1:
+            samples = replacement(i, last)
+            if samples is not None:
+                best = (last, samples)
+            else:
+                lo, hi = i + 1, last  # hi is known to fail
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    samples = replacement(i, mid)
+                    if samples is not None:
+                        lo, best = mid, (mid, samples)
+                    else:
+                        hi = mid
+        if best is None:
+            out.append(poses[i + 1])
+            i += 1
+        else:
+            i, samples = best
+            out.extend(samples[1:])
+    return out
+
+
+def smooth(points, index=None, weight_data=0.1, weight_smooth=0.3, iterations=50, tolerance=1e-2, fixed=1,
+           max_curvature=None, deadline=None):
+    """
+    Gradient-descent smoothing: each interior point is pulled toward its
+    original position (weight_data) and toward the midpoint of its
+    neighbours (weight_smooth). The first and last `fixed` points never
+    move, so the start and end headings survive. A move is rejected if it
+    would bring the point or either adjoining segment within the index's
+    clearance, or raise the discrete curvature at it or a neighbour above
+    `max_curvature` (1 / turning radius). Stops early once the mean
+    per-point move in a sweep drops below `tolerance` meters, or as soon
+    as `deadline` (time.perf_counter()) passes; every accepted move was
+    checked, so a path cut short is still valid.
+    :param points: list of (x, y, ...) points
+    :return: list of (x, y)
+    """
+    original = [(p[0], p[1]) for p in points]
+    path = [list(p) for p in original]
+    lo, hi = max(1, fixed), len(path) - max(1, fixed)
+    if hi <= lo:
+        return original
+
+    for _ in range(iterations):
+        change = 0.0
+        for i in range(lo, hi):
+            if _expired(deadline):
+                return [(p[0], p[1]) for p in path]
+            prev, cur, nxt, orig = path[i - 1], path[i], path[i + 1], original[i]
+            nx = cur[0] + weight_data * (orig[0] - cur[0]) + weight_smooth * (prev[0] + nxt[0] - 2.0 * cur[0])
+            ny = cur[1] + weight_data * (orig[1] - cur[1]) + weight_smooth * (prev[1] + nxt[1] - 2.0 * cur[1])
+            moved = abs(nx - cur[0]) + abs(ny - cur[1])
+            if moved < 1e-6:
+                continue
+            if max_curvature is not None and not _curvature_ok(path, i, nx, ny, max_curvature):
+                continue
+            if index is not None and not (index.segment_free(prev[0], prev[1], nx, ny)
+                                          and index.segment_free(nx, ny, nxt[0], nxt[1])):
+                continue
+            change += moved
+            cur[0], cur[1] = nx, ny
+        if change < tolerance * (hi - lo):
+            break
+    return [(p[0], p[1]) for p in path]
+
+
+def _curvature(a, b, c):
+    """Turn at b divided by the mean length of the two segments meeting there."""
+    l1 = math.hypot(b[0] - a[0], b[1] - a[1])
+    l2 = math.hypot(c[0] - b[0], c[1] - b[1])
+    if l1 < 1e-9 or l2 < 1e-9:
+        return 0.0
+    turn = math.atan2(c[1] - b[1], c[0] - b[0]) - math.atan2(b[1] - a[1], b[0] - a[0])
+    turn = abs((turn + math.pi) % (2.0 * math.pi) - math.pi)
+    return 2.0 * turn / (l1 + l2)
+
+
+def _curvature_ok(path, i, nx, ny, max_curvature):
+    """Would moving path[i] to (nx, ny) keep the curvature at i-1, i, i+1 within bounds (or no worse)?"""
+    old = path[i][0], path[i][1]
+    before = [_curvature(path[k - 1], path[k], path[k + 1]) for k in (i - 1, i, i + 1) if 0 < k < len(path) - 1]
+    path[i][0], path[i][1] = nx, ny
+    after = [_curvature(path[k - 1], path[k], path[k + 1]) for k in (i - 1, i, i + 1) if 0 < k < len(path) - 1]
+    path[i][0], path[i][1] = old
+    return all(a <= max(max_curvature, b) + 1e-9 for a, b in zip(after, before))
+
+
+def max_turn(path):
+    """Largest heading change between consecutive (x, y, theta) waypoints."""
+    return max((abs((b[2] - a[2] + math.pi) % (2.0 * math.pi) - math.pi) for a, b in zip(path, path[1:])),
+               default=0.0)
+
+
+def resample(points, spacing=1.0):
+    """
+    Evenly spaced (x, y, theta) waypoints along the polyline through `points`;
+    theta is the local direction of travel. The final point is always kept.
+    """
+    pts = [(p[0], p[1]) for p in points]
+    if not pts:
+        return []
+    if len(pts) == 1:
+        return [(pts[0][0], pts[0][1], 0.0)]
+
+    out = []
+    carry = 0.0
+    heading = 0.0
+    for (x0, y0), (x1, y1) in zip(pts, pts[1:]):
+        seg = math.hypot(x1 - x0, y1 - y0)
+        if seg < 1e-9:
+            continue
+        heading = math.atan2(y1 - y0, x1 - x0)
+        s = carry
+        while s < seg:
+            t = s / seg
+            out.append((x0 + (x1 - x0) * t, y0 + (y1 - y0) * t, heading))
+            s += spacing
+        carry = s - seg
+
+    end = pts[-1]
+    if not out or math.hypot(out[-1][0] - end[0], out[-1][1] - end[1]) > 1e-6:
+        out.append((end[0], end[1], heading))
+    return out
+
+
+def postprocess(poses, index=None, spacing=1.0, turning_radius=None, use_shortcut=True, clearance=None,
+                check_step=None, deadline=None):
+    """
+    Full pipeline: Dubins shortcut -> densify -> smooth -> resample.
+    Resampling cuts corners slightly, so the result is checked against
+    `clearance` (at most the index's) and against the heading change per
+    waypoint of the unsmoothed path; if the smoothed waypoints fail, the
+    unsmoothed ones are returned instead. The first waypoint keeps the
+    start heading. Past `deadline` (time.perf_counter()) shortcutting stops
+    where it is and smoothing is skipped.
+    :param poses: list of (x, y, theta); theta is needed for shortcutting
+    :param turning_radius: enables shortcutting when set (with `index`)
+    :param check_step: sampling distance for shortcut collision checks (default `spacing`)
+    :return: list of evenly spaced (x, y, theta) waypoints
+    """
+    pts = list(poses)
+    if use_shortcut and index is not None and turning_radius:
+        pts = shortcut(pts, index, turning_radius, check_step or spacing, deadline)
+    dense = resample(pts, spacing)
+    if _expired(deadline):
+        path = dense
+    else:
+        max_curvature = 1.0 / turning_radius if turning_radius else None
+        path = resample(smooth(dense, index, fixed=2, max_curvature=max_curvature, deadline=deadline), spacing)
+    if len(poses[0]) > 2:
+        for p in (dense, path):
+            if p:
+                p[0] = (p[0][0], p[0][1], poses[0][2])
+    if ((index is not None and not index.polyline_free(path, clearance))
+            or (turning_radius and max_turn(path) > max(max_turn(dense), spacing / turning_radius) + 1e-3)):
+        path = dense
+    return path
@@ -2,11 +2,17 @@
 
 import yaml
 import math
+import numpy as np
+from decision_engine import ttc
 from decision_engine.hybrid_astar import HybridAStar
+from telemetry import metrics
+from telemetry.log import get_logger
+
+logger = get_logger("planner")
 
 
 class ResponsePlanner:
-    def __init__(self, vehicle_id, config_path="config/thresholds.yaml"):
+    def __init__(self, vehicle_id, config_path="config/thresholds.yaml", sim_params_path="config/sim_params.yaml"):
         self.vehicle_id = vehicle_id
 
         # Load thresholds from config
@@ -14,7 +20,7 @@ class ResponsePlanner:
             with open(config_path, "r") as f:
                 self.thresholds = yaml.safe_load(f)
         except Exception as e:
-            print(f"[WARNING] Could not load thresholds config: {e}")
+            logger.warning("[PLANNER] Could not load thresholds config: %s", e)
             # Default values as fallback
             self.thresholds = {
                 "brake_distance": 10,
@@ -25,14 +31,49 @@ class ResponsePlanner:
         # Hybrid A* planner (used for rerouting)
         self.hybrid_astar = HybridAStar()
 
-    def decide_action(self, vehicle_pos, obstacles, current_speed=10.0):
+        # Planning budget: a share of the simulation tick, so a hard reroute
+        # returns a partial path on time and resumes on the next tick.
+        planning = self.thresholds.get("planning", {}) or {}
+        self.plan_max_iter = planning.get("max_iter", 5000)
+        self.plan_max_total_iter = planning.get("max_total_iter", 20000)
+        self.plan_budget_ms = None
+        try:
+            with open(sim_params_path, "r") as f:
+                tick_rate = (yaml.safe_load(f) or {}).get("tick_rate")
+            if tick_rate:
+                self.plan_budget_ms = float(tick_rate) * 1000.0 * planning.get("budget_fraction", 0.5)
+        except Exception as e:
+            logger.warning("[PLANNER] Could not load sim params, planning without a time budget: %s", e)
+
+        # "distance" (static thresholds) or "ttc" (time-to-collision bands)
+        self.decision_mode = self.thresholds.get("decision_mode", "distance")
+        self.ttc_config = self.thresholds.get("ttc", {}) or {}
+        if self.decision_mode not in ("distance", "ttc"):
+            raise ValueError(f"[PLANNER] Unknown decision_mode: {self.decision_mode}")
+
+        # Obstacles beyond this range cannot trigger an action or block a reroute
+        # (reroute goals sit ~16 m past the triggering obstacle).
+        self.perception_radius = self.thresholds.get("reroute_distance", 40) + 20.0
+        if self.decision_mode == "ttc":
+            self.perception_radius = max(self.perception_radius, self._ttc_reach() + 20.0)
+
+    def decide_action(self, vehicle_pos, obstacles, current_speed=10.0, velocity=None, sender=None):
         """
         Decide the action based on vehicle state and obstacles.
         - vehicle_pos: (x, y)
         - obstacles: list of dicts with {"x": float, "y": float}
         - current_speed: vehicle speed in m/s
-        Returns: str (BRAKE, SLOW_DOWN, KEEP_SPEED) or dict {"action": "REROUTE", "path": [...]}
+        - velocity: (vx, vy) in m/s, used by the "ttc" decision mode when known
+        - sender: id of the vehicle this decision is for; an unfinished reroute
+          for it is resumed on its next decision
+        Returns: str (BRAKE, SLOW_DOWN, KEEP_SPEED) or dict
+                 {"action": "REROUTE", "path": [(x, y, theta), ...], "complete": bool};
+                 "complete" is False when the planning budget ran out and "path"
+                 only reaches the closest point found so far.
         """
+        if self.decision_mode == "ttc":
+            return self._decide_by_ttc(vehicle_pos, obstacles, current_speed, velocity, sender)
+
         for obs in obstacles:
             dx = obs["x"] - vehicle_pos[0]
             dy = obs["y"] - vehicle_pos[1]
@@ -43,11 +84,72 @@ class ResponsePlanner:
             elif dist <= self.thresholds.get("slowdown_distance", 20):
                 return "SLOW_DOWN"
             elif dist <= self.thresholds.get("reroute_distance", 40):
-                # Plan new path using Hybrid A*
-                print(f"[PLANNER] Vehicle {self.vehicle_id} running Hybrid A* for reroute...")
-                start = (vehicle_pos[0], vehicle_pos[1])
-                goal = {"x": obs["x"] + 15, "y": obs["y"] + 5}  # pick a reroute target past the obstacle
-                new_path = self.hybrid_astar.plan(start, goal)
-                return {"action": "REROUTE", "path": new_path}
+                return self._reroute(vehicle_pos, obs, obstacles, sender)
+
+        return "KEEP_SPEED"
+
+    def _reroute(self, vehicle_pos, obs, obstacles, sender=None):
+        """Plan a new path around `obs` using Hybrid A*."""
+        logger.debug("[PLANNER] Vehicle %s running Hybrid A* for reroute...", self.vehicle_id)
+        start = (vehicle_pos[0], vehicle_pos[1])
+        goal = {"x": obs["x"] + 15, "y": obs["y"] + 5}  # pick a reroute target past the obstacle
+        points = [(o["x"], o["y"]) for o in obstacles]
+        with metrics.stage("plan"):
+            new_path = self.hybrid_astar.plan(start, goal, points, max_iter=self.plan_max_iter,
+                                              deadline_ms=self.plan_budget_ms, resume=True, key=sender,
+                                              max_total_iter=self.plan_max_total_iter)
+        complete = self.hybrid_astar.last_stats.get("found", False)
+        if not complete:
+            metrics.inc("v2v_plan_partial_total")
+        return {"action": "REROUTE", "path": new_path, "complete": complete}
+
+    # -------------------- TTC mode --------------------
+
+    def _ttc_reach(self):
+        """Farthest an obstacle can be and still fall inside the reroute TTC band."""
+        cfg = self.ttc_config
+        return cfg.get("max_closing_speed", 40.0) * cfg.get("reroute_time", 5.0) + cfg.get("collision_radius", 2.0)
+
+    def _decide_by_ttc(self, vehicle_pos, obstacles, current_speed, velocity, sender=None):
+        """
+        Pick the action from the most urgent obstacle's time-to-collision.
+        Without a velocity the heading is unknown, so every obstacle is
+        assumed to lie dead ahead (TTC = gap / speed), the conservative case.
+        Obstacles inside brake_distance always brake, whatever their TTC.
+        """
+        cfg = self.ttc_config
+        points = ttc.as_points(obstacles)
+        if len(points) == 0:
+            return "KEEP_SPEED"
+
+        pos = (float(vehicle_pos[0]), float(vehicle_pos[1]))
+        radius = cfg.get("collision_radius", 2.0)
+
+        # Per-decision budget: only obstacles that could enter the reroute band,
+        # and at most max_pairs of the nearest of those.
+        candidates = ttc.nearest_within_budget(pos, points, cfg.get("max_pairs", 20000), self._ttc_reach())
+        if len(candidates) == 0:
+            return "KEEP_SPEED"
+        near = points[candidates]
+
+        gaps = np.hypot(near[:, 0] - pos[0], near[:, 1] - pos[1])
+        closest = int(np.argmin(gaps))
+        if gaps[closest] <= self.thresholds.get("brake_distance", 10):
+            return "BRAKE"
+
+        if velocity is not None:
+            min_ttc, index = ttc.min_time_to_collision(pos, velocity, near, radius=radius)
+            t, i = float(min_ttc[0]), int(index[0])
+        else:
+            speed = max(float(current_speed or 0.0), cfg.get("min_closing_speed", 0.1))
+            t_all = np.maximum(gaps - radius, 0.0) / speed
+            i = int(np.argmin(t_all))
+            t = float(t_all[i])
 
+        if t <= cfg.get("brake_time", 1.5):
+            return "BRAKE"
+        if t <= cfg.get("slowdown_time", 3.0):
+            return "SLOW_DOWN"
+        if t <= cfg.get("reroute_time", 5.0):
+            return self._reroute(pos, obstacles[int(candidates[i])], obstacles, sender)
         return "KEEP_SPEED"
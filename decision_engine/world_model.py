@@ -0,0 +1,212 @@
+# decision_engine/world_model.py
+"""
+Per-receiver world model that fuses obstacle reports from every sender.
+
+Each V2V message carries the sender's own obstacle list, so with N
+vehicles the same physical obstacle arrives N times. WorldModel keeps
+one entry per obstacle in a uniform spatial hash grid:
+  - a report within `dedup_radius` of an existing entry refreshes that
+    entry (position becomes the running mean of the reports); each entry
+    takes at most one report per message, so distinct points a sender
+    lists close together (a wall sampled every 0.5 m) stay distinct,
+  - entries expire `ttl` seconds after they were last reported,
+  - obstacles() / query_radius() / query_box() return the compact set.
+"""
+
+import heapq
+import math
+import time
+
+
+class _Entry:
+    __slots__ = ("x", "y", "expires", "reports", "senders", "cell", "alive")
+
+    def __init__(self, x, y, expires, sender, cell):
+        self.x = x
+        self.y = y
+        self.expires = expires
+        self.reports = 1
+        self.senders = {sender}
+        self.cell = cell
+        self.alive = True
+
+
+class WorldModel:
+    def __init__(self, cell_size=5.0, dedup_radius=1.0, ttl=2.0, max_reports_weight=20):
+        """
+        :param cell_size: grid cell edge (meters); must be >= dedup_radius
+        :param dedup_radius: reports closer than this are the same obstacle (meters)
+        :param ttl: seconds an obstacle survives without a fresh report
+        :param max_reports_weight: cap on the running-mean weight so moved obstacles still converge
+        """
+        if cell_size < dedup_radius:
+            raise ValueError("[WORLD] cell_size must be >= dedup_radius.")
+        self.cell_size = float(cell_size)
+        self.dedup_radius = float(dedup_radius)
+        self.ttl = float(ttl)
+        self.max_reports_weight = int(max_reports_weight)
+
+        self._grid = {}        # (cx, cy) -> list[_Entry]
+        self._expiry = []      # heap of (expires, seq, entry); stale items skipped on pop
+        self._seq = 0
+        self._size = 0
+        self._cache = None     # cached obstacles() list, rebuilt after changes
+
+        self.merged = 0        # reports folded into an existing entry
+        self.inserted = 0
+        self.expired = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from the `world_model` section of thresholds.yaml (missing keys use defaults)."""
+        section = (config or {}).get("world_model", {}) or {}
+        return cls(
+            cell_size=section.get("cell_size", 5.0),
+            dedup_radius=section.get("dedup_radius", 1.0),
+            ttl=section.get("ttl", 2.0),
+        )
+
+    def __len__(self):
+        return self._size
+
+    # -------------------- updates --------------------
+
+    def update(self, message, now=None):
+        """
+        Merge one decoded V2V message into the model.
+        The message's `timestamp` (when present) is the report time;
+        otherwise `now` (receive time) is used.
+        """
+        if now is None:
+            now = time.time()
+        self.expire(now)
+
+        seen = message.get("timestamp", now)
+        sender = message.get("vehicle_id")
+        claimed = set()
+        for obs in message.get("obstacles") or ():
+            claimed.add(self.add(obs["x"], obs["y"], seen, sender, claimed))
+
+    def add(self, x, y, seen, sender=None, claimed=None):
+        """
+        Insert one obstacle report, merging it with a nearby entry if there is one.
+        :param claimed: entries already matched by other reports in the same
+                        message; they are skipped, so one message never merges
+                        two of its own points into one entry
+        :return: the entry the report was merged into or created
+        """
+        expires = seen + self.ttl
+        cell = self._cell(x, y)
+        entry = self._nearest(x, y, cell, claimed)
+
+        if entry is not None:
+            weight = min(entry.reports, self.max_reports_weight)
+            entry.x += (x - entry.x) / (weight + 1)
+            entry.y += (y - entry.y) / (weight + 1)
+            entry.reports += 1
+            entry.senders.add(sender)
+            if expires > entry.expires:
+                entry.expires = expires
+                self._push_expiry(entry)
+            new_cell = self._cell(entry.x, entry.y)
+            if new_cell != entry.cell:
+                bucket = self._grid[entry.cell]
+                bucket.remove(entry)
+                if not bucket:
+                    del self._grid[entry.cell]
+                self._grid.setdefault(new_cell, []).append(entry)
+                entry.cell = new_cell
+            self.merged += 1
+        else:
+            entry = _Entry(x, y, expires, sender, cell)
+            self._grid.setdefault(cell, []).append(entry)
+            self._push_expiry(entry)
+            self._size += 1
+            self.inserted += 1
+        self._cache = None
+        return entry
+
+    def expire(self, now=None):
+        """Drop entries whose TTL has passed. Cost is proportional to what expires."""
+        if now is None:
+            now = time.time()
+        heap = self._expiry
+        while heap and heap[0][0] <= now:
+            expires, _, entry = heapq.heappop(heap)
+            if not entry.alive or entry.expires != expires:
+                continue  # refreshed since this heap item was pushed
+            entry.alive = False
+            bucket = self._grid[entry.cell]
+            bucket.remove(entry)
+            if not bucket:
+                del self._grid[entry.cell]
+            self._size -= 1
+            self.expired += 1
+            self._cache = None
+
+    def clear(self):
+        """Drop every entry and reset the merged / inserted / expired counters."""
+        self._grid.clear()
+        self._expiry.clear()
+        self._size = 0
+        self._cache = None
+        self.merged = 0
+        self.inserted = 0
+        self.expired = 0
+
+    # -------------------- queries --------------------
+
+    def obstacles(self):
+        """All live obstacles as [{"x": .., "y": ..}, ...] (cached until the next change)."""
+        if self._cache is None:
+            self._cache = [{"x": e.x, "y": e.y} for bucket in self._grid.values() for e in bucket]
+        return self._cache
+
+    def points(self):
+        """All live obstacles as (x, y) tuples, the format HybridAStar takes."""
+        return [(e.x, e.y) for bucket in self._grid.values() for e in bucket]
+
+    def query_box(self, xmin, ymin, xmax, ymax):
+        """Obstacles inside the axis-aligned box, as dicts."""
+        out = []
+        c0x, c0y = self._cell(xmin, ymin)
+        c1x, c1y = self._cell(xmax, ymax)
+        grid = self._grid
+        if (c1x - c0x + 1) * (c1y - c0y + 1) > len(grid):
+            # Box covers more cells than are occupied; scan occupied cells instead.
+            cells = [c for c in grid if c0x <= c[0] <= c1x and c0y <= c[1] <= c1y]
+        else:
+            cells = [(cx, cy) for cx in range(c0x, c1x + 1) for cy in range(c0y, c1y + 1)]
+        for cell in cells:
+            for e in grid.get(cell, ()):
+                if xmin <= e.x <= xmax and ymin <= e.y <= ymax:
+                    out.append({"x": e.x, "y": e.y})
+        return out
+
+    def query_radius(self, x, y, radius):
+        """Obstacles within `radius` of (x, y), as dicts."""
+        r2 = radius * radius
+        return [o for o in self.query_box(x - radius, y - radius, x + radius, y + radius)
+                if (o["x"] - x) ** 2 + (o["y"] - y) ** 2 <= r2]
+
+    # -------------------- internals --------------------
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def _nearest(self, x, y, cell, claimed=None):
+        """Closest live entry within dedup_radius and not in `claimed`, searching the 3x3 cell neighbourhood."""
+        best, best_d2 = None, self.dedup_radius * self.dedup_radius
+        cx, cy = cell
+        grid = self._grid
+        for nx in (cx - 1, cx, cx + 1):
+            for ny in (cy - 1, cy, cy + 1):
+                for e in grid.get((nx, ny), ()):
+                    d2 = (e.x - x) ** 2 + (e.y - y) ** 2
+                    if d2 <= best_d2 and not (claimed and e in claimed):
+                        best, best_d2 = e, d2
+        return best
+
+    def _push_expiry(self, entry):
+        self._seq += 1
+        heapq.heappush(self._expiry, (entry.expires, self._seq, entry))
@@ -1,6 +1,10 @@
 import math
 import time
 
+from telemetry.log import get_logger
+
+logger = get_logger("vehicle_manager")
+
 
 class VehicleManager:
     """
@@ -28,7 +32,7 @@ class VehicleManager:
     def apply_brake(self, vehicle):
         """Apply full brake to stop vehicle quickly."""
         vehicle.set_action([0.0, -1.0])  # [steering, throttle-brake]
-        print(f"[ACTION] Vehicle {vehicle.id} -> BRAKE")
+        logger.info("[ACTION] Vehicle %s -> BRAKE", vehicle.id)
 
     def apply_slowdown(self, vehicle, factor=0.5):
         """Reduce vehicle speed by throttling down."""
@@ -36,12 +40,12 @@ class VehicleManager:
         target_speed = max(current_speed * factor, 1.0)
         throttle = target_speed / max(current_speed, 1.0)
         vehicle.set_action([0.0, throttle])
-        print(f"[ACTION] Vehicle {vehicle.id} -> SLOW_DOWN to {target_speed:.2f} m/s")
+        logger.info("[ACTION] Vehicle %s -> SLOW_DOWN to %.2f m/s", vehicle.id, target_speed)
 
     def keep_speed(self, vehicle, target_throttle=0.5):
         """Maintain current cruising speed."""
         vehicle.set_action([0.0, target_throttle])
-        print(f"[ACTION] Vehicle {vehicle.id} -> KEEP_SPEED at throttle {target_throttle}")
+        logger.info("[ACTION] Vehicle %s -> KEEP_SPEED at throttle %s", vehicle.id, target_throttle)
 
     # -----------------------------
     # Hybrid A* Path Following
@@ -56,7 +60,7 @@ class VehicleManager:
             waypoint_reach_thresh: distance threshold to consider a waypoint reached
             sleep_time: sleep between steps (for real-time sim control)
         """
-        print(f"[FOLLOW_PATH] Vehicle {vehicle.id} starting path with {len(path)} waypoints")
+        logger.info("[FOLLOW_PATH] Vehicle %s starting path with %d waypoints", vehicle.id, len(path))
 
         for i, (x, y, theta) in enumerate(path):
             while True:
@@ -67,7 +71,7 @@ class VehicleManager:
                 distance = math.sqrt(dx**2 + dy**2)
 
                 if distance < waypoint_reach_thresh:
-                    print(f"[FOLLOW_PATH] Vehicle {vehicle.id} reached waypoint {i+1}/{len(path)}")
+                    logger.debug("[FOLLOW_PATH] Vehicle %s reached waypoint %d/%d", vehicle.id, i + 1, len(path))
                     break  # Move to next waypoint
 
                 # Steering control towards waypoint
@@ -81,7 +85,7 @@ class VehicleManager:
                 vehicle.set_action([steering, throttle])
                 time.sleep(sleep_time)
 
-        print(f"[FOLLOW_PATH] Vehicle {vehicle.id} finished Hybrid A* path.")
+        logger.info("[FOLLOW_PATH] Vehicle %s finished Hybrid A* path.", vehicle.id)
 
     # -----------------------------
     # Helper Methods
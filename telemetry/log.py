@@ -0,0 +1,90 @@
+# telemetry/log.py
+"""
+Level-gated, rate-limited logging for the V2V processes.
+
+Modules get a logger with get_logger("receiver") and keep their
+"[TAG] message" style; configure_logging() applies the `logging`
+section of v2v_settings.yaml:
+
+logging:
+  enabled: true
+  level: "INFO"
+  rate_limit: 5.0        # max records/sec per call site (0 = unlimited)
+  burst: 10              # records allowed back-to-back before limiting
+  format: "%(message)s"
+  file: null             # optional log file instead of stderr
+"""
+
+import logging
+import time
+
+ROOT_LOGGER = "v2v"
+DEFAULT_FORMAT = "%(message)s"
+
+
+def get_logger(name):
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per call site (logger, file, line). Dropped records are
+    counted and reported on the next record that gets through, so a
+    flood shows up as "... (N similar suppressed)" rather than vanishing.
+    Errors and above are never dropped.
+    """
+
+    def __init__(self, rate=5.0, burst=10):
+        super().__init__()
+        self.rate = float(rate)
+        self.burst = float(max(1, burst))
+        self._buckets = {}  # key -> [tokens, last_refill, suppressed]
+
+    def filter(self, record):
+        if self.rate <= 0 or record.levelno >= logging.ERROR:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now, 0]
+
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < 1.0:
+            bucket[0] = tokens
+            bucket[2] += 1
+            return False
+
+        bucket[0] = tokens - 1.0
+        if bucket[2]:
+            record.msg = f"{record.msg} ({bucket[2]} similar suppressed)"
+            bucket[2] = 0
+        return True
+
+
+def configure_logging(config):
+    """Configure the "v2v" logger tree from a v2v_settings.yaml dict."""
+    section = (config or {}).get("logging", {}) or {}
+    root = logging.getLogger(ROOT_LOGGER)
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.propagate = False
+
+    if not section.get("enabled", True):
+        root.setLevel(logging.CRITICAL + 1)
+        root.addHandler(logging.NullHandler())
+        return root
+
+    level = section.get("level", "INFO")
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    log_file = section.get("file")
+    handler = logging.FileHandler(log_file) if log_file else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(section.get("format", DEFAULT_FORMAT)))
+    handler.addFilter(RateLimitFilter(section.get("rate_limit", 5.0), section.get("burst", 10)))
+    root.addHandler(handler)
+    return root
@@ -0,0 +1,374 @@
+# telemetry/metrics.py
+"""
+Counters, gauges and latency histograms for the V2V pipeline.
+
+Everything is off until enable() (or configure_metrics() with
+`metrics.enabled: true`) is called. While disabled, the module-level
+helpers (inc, set_gauge, observe, stage) return immediately, and
+stage() hands back a shared no-op context manager, so the hot loops
+pay roughly one function call and a flag check per hook.
+
+Pipeline stages are timed into one histogram per stage:
+    encode, encrypt, send, recv, decrypt, decode, decide, plan
+
+    with metrics.stage("decrypt"):
+        data = encryption.decrypt(data)
+
+Snapshots can be written to a JSON file or served in the Prometheus
+text exposition format.
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STAGES = ("encode", "encrypt", "send", "recv", "decrypt", "decode", "decide", "plan")
+STAGE_HISTOGRAM = "v2v_stage_latency_seconds"
+
+_ENABLED = False
+
+
+def enable(flag=True):
+    global _ENABLED
+    _ENABLED = bool(flag)
+
+
+def is_enabled():
+    return _ENABLED
+
+
+# -------------------- metric types --------------------
+
+class Counter:
+    """Monotonically increasing count."""
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, n=1):
+        self.value += n
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    """Last-written value."""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value):
+        self.value = value
+
+    def snapshot(self):
+        return self.value
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram over integer microseconds.
+    Values below 2^SUB_BITS us are exact; above that each power-of-two
+    range is split into 2^(SUB_BITS-1) linear sub-buckets, which bounds
+    the relative error to about 1 / 2^(SUB_BITS-1) (~3% for SUB_BITS=6).
+    """
+
+    SUB_BITS = 6
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def record(self, seconds):
+        us = int(seconds * 1e6)
+        if us < 0:
+            us = 0
+        shift = us.bit_length() - self.SUB_BITS
+        if shift <= 0:
+            index = us
+        else:
+            index = (shift << self.SUB_BITS) | (us >> shift)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def _bucket_bounds(self, index):
+        """[low, high) bounds of a bucket, in microseconds."""
+        shift = index >> self.SUB_BITS
+        if shift == 0:
+            return index, index + 1
+        mantissa = index & ((1 << self.SUB_BITS) - 1)
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def percentile(self, pct):
+        """Upper bound (seconds) of the bucket holding the given percentile."""
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100.0
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._bucket_bounds(index)[1] / 1e6, self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        self.__init__()
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+
+    def format(self, width=40, rows=16):
+        """ASCII rendering, merging sub-buckets down to at most `rows` lines."""
+        if not self.counts:
+            return ""
+        merged = {}
+        for index, n in self.counts.items():
+            low = self._bucket_bounds(index)[0]
+            octave = max(low, 1).bit_length()
+            merged[octave] = merged.get(octave, 0) + n
+        octaves = sorted(merged)[:rows]
+        peak = max(merged.values())
+        lines = []
+        for octave in octaves:
+            n = merged[octave]
+            lo, hi = (1 << (octave - 1)) if octave > 1 else 0, 1 << octave
+            bar = "#" * max(1, int(width * n / peak))
+            lines.append(f"  {lo:>9d}-{hi:<9d}us {n:>8d} {bar}")
+        return "\n".join(lines)
+
+
+# -------------------- registry --------------------
+
+class MetricsRegistry:
+    """Get-or-create store of named metrics, optionally with labels."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kind, name, labels):
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = kind()
+                    self._metrics[key] = metric
+        if not isinstance(metric, kind):
+            raise TypeError(f"[METRICS] {name} already registered as {type(metric).__name__}")
+        return metric
+
+    def counter(self, name, **labels):
+        return self._get(Counter, name, labels)
+
+    def gauge(self, name, **labels):
+        return self._get(Gauge, name, labels)
+
+    def histogram(self, name, **labels):
+        return self._get(LatencyHistogram, name, labels)
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+    def snapshot(self):
+        """Plain-dict view: {"counters": {...}, "gauges": {...}, "histograms": {...}}."""
+        out = {"timestamp": time.time(), "counters": {}, "gauges": {}, "histograms": {}}
+        section = {Counter: "counters", Gauge: "gauges", LatencyHistogram: "histograms"}
+        for (name, labels), metric in list(self._metrics.items()):
+            out[section[type(metric)]][_series_name(name, labels)] = metric.snapshot()
+        return out
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (histograms exported as summaries)."""
+        lines = []
+        typed = set()
+        kinds = {Counter: "counter", Gauge: "gauge", LatencyHistogram: "summary"}
+        for (name, labels), metric in sorted(self._metrics.items(), key=lambda kv: kv[0]):
+            if name not in typed:
+                lines.append(f"# TYPE {name} {kinds[type(metric)]}")
+                typed.add(name)
+            if isinstance(metric, LatencyHistogram):
+                for q in (0.5, 0.9, 0.99):
+                    series = _series_name(name, labels + (("quantile", str(q)),))
+                    lines.append(f"{series} {metric.percentile(q * 100):.9f}")
+                lines.append(f"{_series_name(name + '_sum', labels)} {metric.total:.9f}")
+                lines.append(f"{_series_name(name + '_count', labels)} {metric.count}")
+            else:
+                lines.append(f"{_series_name(name, labels)} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+
+def _series_name(name, labels):
+    if not labels:
+        return name
+    body = ",".join(f'{k}="{v}"' for k, v in labels)
+    return f"{name}{{{body}}}"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# -------------------- hot-path helpers --------------------
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _StageTimer:
+    __slots__ = ("histogram", "_t0")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self._t0 = 0.0
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.record(time.perf_counter() - self._t0)
+        return False
+
+
+_NULL_STAGE = _NullStage()
+_stage_histograms = {}
+
+
+def stage(name):
+    """Context manager timing one pipeline stage (no-op while disabled)."""
+    if not _ENABLED:
+        return _NULL_STAGE
+    histogram = _stage_histograms.get(name)
+    if histogram is None:
+        histogram = _stage_histograms[name] = REGISTRY.histogram(STAGE_HISTOGRAM, stage=name)
+    return _StageTimer(histogram)
+
+
+def inc(name, n=1, **labels):
+    if _ENABLED:
+        REGISTRY.counter(name, **labels).inc(n)
+
+
+def set_gauge(name, value, **labels):
+    if _ENABLED:
+        REGISTRY.gauge(name, **labels).set(value)
+
+
+def observe(name, seconds, **labels):
+    if _ENABLED:
+        REGISTRY.histogram(name, **labels).record(seconds)
+
+
+def reset():
+    REGISTRY.reset()
+    _stage_histograms.clear()
+
+
+# -------------------- exporters --------------------
+
+def write_snapshot(path, registry=REGISTRY):
+    """Atomically write a JSON snapshot of all metrics to `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(registry.snapshot(), f, indent=2)
+    os.replace(tmp, path)
+
+
+def start_snapshot_writer(path, interval=5.0, registry=REGISTRY):
+    """Write snapshots every `interval` seconds from a daemon thread."""
+    stop = threading.Event()
+
+    def _loop():
+        while not stop.wait(interval):
+            write_snapshot(path, registry)
+        write_snapshot(path, registry)
+
+    thread = threading.Thread(target=_loop, name="metrics-snapshot", daemon=True)
+    thread.start()
+    return stop
+
+
+def serve_prometheus(port, host="127.0.0.1", registry=REGISTRY):
+    """Serve GET /metrics in Prometheus text format from a daemon thread."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # keep scrapes out of the console
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    return server
+
+
+def configure_metrics(config):
+    """
+    Apply the `metrics` section of v2v_settings.yaml:
+        enabled, snapshot_path, snapshot_interval, prometheus_port, prometheus_host
+    Returns a dict of the started exporters (snapshot stop event / http server).
+    """
+    section = (config or {}).get("metrics", {}) or {}
+    enable(section.get("enabled", False))
+    exporters = {}
+    if not _ENABLED:
+        return exporters
+
+    if section.get("snapshot_path"):
+        exporters["snapshot"] = start_snapshot_writer(
+            section["snapshot_path"], float(section.get("snapshot_interval", 5.0)))
+    if section.get("prometheus_port"):
+        exporters["prometheus"] = serve_prometheus(
+            int(section["prometheus_port"]), section.get("prometheus_host", "127.0.0.1"))
+    return exporters
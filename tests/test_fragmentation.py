@@ -0,0 +1,104 @@
+# tests/test_fragmentation.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from communication.fragmentation import HEADER, MAGIC, Fragmenter, Reassembler
+
+
+def _fragments(size, mtu=100):
+    message = os.urandom(size)
+    return message, Fragmenter(mtu).fragment(message)
+
+
+def test_small_message_passes_through():
+    message, fragments = _fragments(50)
+    assert fragments == [message]
+    assert Reassembler().feed(message) is message
+
+
+def test_out_of_order_fragments_reassemble():
+    message, fragments = _fragments(1000)
+    reassembler = Reassembler()
+    outs = [reassembler.feed(f, now=0.0) for f in reversed(fragments)]
+    assert outs[:-1] == [None] * (len(fragments) - 1)
+    assert bytes(outs[-1]) == message
+    assert reassembler.completed == 1
+    assert len(reassembler) == 0 and reassembler.buffered_bytes == 0
+
+
+def test_duplicate_fragment_is_ignored():
+    message, fragments = _fragments(1000)
+    reassembler = Reassembler()
+    assert reassembler.feed(fragments[0], now=0.0) is None
+    assert reassembler.feed(fragments[0], now=0.0) is None
+    assert reassembler.duplicates == 1
+    for f in fragments[1:-1]:
+        reassembler.feed(f, now=0.0)
+    assert bytes(reassembler.feed(fragments[-1], now=0.0)) == message
+
+
+def test_late_duplicate_after_completion_does_not_restart():
+    _, fragments = _fragments(1000)
+    reassembler = Reassembler()
+    for f in fragments:
+        reassembler.feed(f, now=0.0)
+    assert reassembler.feed(fragments[2], now=0.0) is None
+    assert reassembler.duplicates == 1
+    assert len(reassembler) == 0 and reassembler.buffered_bytes == 0
+
+
+def test_mismatched_count_is_rejected():
+    _, fragments = _fragments(1000)
+    reassembler = Reassembler()
+    reassembler.feed(fragments[0], now=0.0)
+    _, message_id, index, count, total = HEADER.unpack_from(fragments[1])
+    forged = HEADER.pack(MAGIC, message_id, index, count + 1, total) + fragments[1][HEADER.size:]
+    assert reassembler.feed(forged, now=0.0) is None
+    assert reassembler.rejected == 1
+
+
+def test_wrong_fragment_length_is_rejected():
+    _, fragments = _fragments(1000)
+    reassembler = Reassembler()
+    assert reassembler.feed(fragments[0][:-1], now=0.0) is None
+    assert reassembler.rejected == 1
+
+
+def test_oversize_and_invalid_headers_are_rejected():
+    reassembler = Reassembler(max_message=1000)
+    oversize = HEADER.pack(MAGIC, 1, 0, 2, 1001) + bytes(501)
+    bad_index = HEADER.pack(MAGIC, 2, 2, 2, 100) + bytes(50)
+    bad_count = HEADER.pack(MAGIC, 3, 0, 0, 100) + bytes(50)
+    for datagram in (oversize, bad_index, bad_count):
+        assert reassembler.feed(datagram, now=0.0) is None
+    assert reassembler.rejected == 3
+    assert len(reassembler) == 0 and reassembler.buffered_bytes == 0
+
+
+def test_incomplete_message_times_out():
+    _, fragments = _fragments(1000)
+    reassembler = Reassembler(timeout=1.0)
+    reassembler.feed(fragments[0], now=0.0)
+    assert reassembler.expire(0.5) == 0
+    assert reassembler.expire(1.0) == 1
+    assert reassembler.expired == 1
+    assert len(reassembler) == 0 and reassembler.buffered_bytes == 0
+    # The message id was never completed, so a late fragment starts it over
+    assert reassembler.feed(fragments[1], now=1.5) is None
+    assert len(reassembler) == 1
+
+
+def test_oldest_partial_is_evicted_under_max_bytes():
+    reassembler = Reassembler(max_bytes=2500)
+    first, second, third = (_fragments(1000)[1] for _ in range(3))
+    reassembler.feed(first[0], now=0.0)
+    reassembler.feed(second[0], now=0.1)
+    assert reassembler.buffered_bytes == 2000
+    reassembler.feed(third[0], now=0.2)
+    assert reassembler.evicted == 1
+    assert len(reassembler) == 2 and reassembler.buffered_bytes == 2000
+    # The evicted message can no longer complete
+    assert all(reassembler.feed(f, now=0.3) is None for f in first[1:])
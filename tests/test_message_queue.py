@@ -0,0 +1,108 @@
+# tests/test_message_queue.py
+
+import base64
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from communication.encryption import EncryptionManager
+from communication.message_format import encode_message, pack_seq_header, parse_seq_header
+from communication.message_queue import LatestMessageQueue
+from communication.receiver import receive_message
+
+
+def _message(sender, seq=None, timestamp=None):
+    message = {"vehicle_id": sender, "obstacles": []}
+    if seq is not None:
+        message["seq"] = seq
+    if timestamp is not None:
+        message["timestamp"] = timestamp
+    return message
+
+
+def test_duplicate_and_out_of_order_are_rejected():
+    queue = LatestMessageQueue(max_age=0.5)
+    assert queue.offer(_message("a", 5, 100.0), 100.0)
+    assert not queue.offer(_message("a", 5, 100.0), 100.0)
+    assert not queue.offer(_message("a", 4, 99.9), 100.0)
+    assert queue.duplicates == 1 and queue.out_of_order == 1
+    assert [m["seq"] for m in queue.drain(100.0)] == [5]
+
+
+def test_restarted_sender_is_accepted():
+    queue = LatestMessageQueue(max_age=0.5)
+    assert queue.offer(_message("a", 500, 100.0), 100.0)
+    queue.drain(100.0)
+    # Lower seq but a newer timestamp: the sender restarted its counter
+    assert queue.offer(_message("a", 1, 100.2), 100.2)
+    assert queue.out_of_order == 0
+    # ...and its counter is now the reference
+    assert not queue.offer(_message("a", 1, 100.2), 100.2)
+    assert queue.duplicates == 1
+
+
+def test_stale_messages_are_dropped_on_offer_and_drain():
+    queue = LatestMessageQueue(max_age=0.5)
+    assert not queue.offer(_message("a", 1, 100.0), 100.6)
+    assert queue.offer(_message("b", 1, 100.0), 100.2)
+    assert queue.drain(100.6) == []
+    assert queue.stale == 2
+
+
+def test_newest_message_per_sender_is_kept():
+    queue = LatestMessageQueue(max_age=0.5)
+    for seq in (1, 2, 3):
+        queue.offer(_message("a", seq, 100.0 + seq * 0.01), 100.1)
+    queue.offer(_message("b", 7, 100.05), 100.1)
+    drained = {m["vehicle_id"]: m["seq"] for m in queue.drain(100.1)}
+    assert drained == {"a": 3, "b": 7}
+    assert queue.coalesced == 2
+    assert len(queue) == 0
+
+
+def test_messages_without_seq_or_timestamp_skip_checks():
+    queue = LatestMessageQueue(max_age=0.5)
+    assert queue.offer(_message("legacy"), 100.0)
+    assert queue.offer(_message("legacy"), 100.0)
+    assert queue.duplicates == 0 and queue.coalesced == 1
+    assert len(queue.drain(1000.0)) == 1
+
+
+def test_forget_resets_sender():
+    queue = LatestMessageQueue(max_age=0)
+    queue.offer(_message("a", 10, 100.0), 100.0)
+    queue.forget("a")
+    assert len(queue) == 0
+    assert queue.offer(_message("a", 1, 50.0), 100.0)
+
+
+def test_check_counts_rejections_without_remembering():
+    queue = LatestMessageQueue(max_age=0.5)
+    assert queue.check("a", 1, 100.0, 100.0)
+    assert queue.check("a", 1, 100.0, 100.0)  # nothing recorded yet
+    queue.offer(_message("a", 1, 100.0), 100.0)
+    assert not queue.check("a", 1, 100.0, 100.0)
+    assert not queue.check("a", 2, 99.0, 100.0)
+    assert queue.duplicates == 1 and queue.stale == 1
+    assert len(queue) == 1
+
+
+def test_seq_header_roundtrip():
+    data = pack_seq_header("vehicle_7", 42, 1234.5) + b"payload"
+    sender, seq, timestamp, payload = parse_seq_header(data)
+    assert (sender, seq, timestamp, bytes(payload)) == ("vehicle_7", 42, 1234.5, b"payload")
+    assert parse_seq_header(b"{}") == (None, None, None, b"{}")
+
+
+def test_duplicates_are_dropped_before_decryption():
+    key = base64.b64encode(bytes(range(32))).decode()
+    encryption = EncryptionManager({"encryption": {"enabled": True, "key": key}})
+    queue = LatestMessageQueue(max_age=0.5)
+    header = pack_seq_header("a", 1, 100.0)
+    message = encryption.encrypt(encode_message("a", {"x": 0, "y": 0}, 0, [], seq=1, timestamp=100.0))
+    assert receive_message(header + message, encryption, queue, 100.0)
+    # Same header over a ciphertext that would not even decrypt: rejected by header alone
+    assert not receive_message(header + b"not a ciphertext", encryption, queue, 100.0)
+    assert queue.duplicates == 1
+    assert [m["seq"] for m in queue.drain(100.0)] == [1]
@@ -0,0 +1,38 @@
+# tests/test_path_smoothing.py
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from decision_engine import path_smoothing
+from decision_engine.obstacle_index import ObstacleIndex
+
+
+def _zigzag():
+    """A drivable but wasteful path: gentle weaves along +x."""
+    return [(float(i), 0.8 * math.sin(i / 3.0), 0.0) for i in range(40)]
+
+
+def test_shortcut_stops_at_deadline():
+    index = ObstacleIndex([(20.0, 10.0)], clearance=2.0)
+    poses = _zigzag()
+    assert path_smoothing.shortcut(poses, index, turning_radius=4.6, deadline=0.0) == poses
+    assert len(path_smoothing.shortcut(poses, index, turning_radius=4.6)) != len(poses)
+
+
+def test_smooth_stops_at_deadline():
+    points = [(p[0], p[1]) for p in _zigzag()]
+    assert path_smoothing.smooth(points, deadline=0.0) == points
+    assert path_smoothing.smooth(points) != points
+
+
+def test_postprocess_past_deadline_only_resamples():
+    index = ObstacleIndex([(20.0, 10.0)], clearance=2.0)
+    poses = _zigzag()
+    path = path_smoothing.postprocess(poses, index, spacing=1.0, turning_radius=4.6, clearance=2.0,
+                                      deadline=0.0)
+    expected = path_smoothing.resample(poses, 1.0)
+    expected[0] = (expected[0][0], expected[0][1], poses[0][2])
+    assert path == expected
@@ -0,0 +1,40 @@
+# tests/test_recorder.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from communication.recorder import MessageLog, MessageRecorder
+
+
+def _capture(tmp_path, payloads):
+    path = str(tmp_path / "capture.v2vcap")
+    with MessageRecorder(path) as recorder:
+        for i, payload in enumerate(payloads):
+            recorder.record(payload, timestamp=1000.0 + i)
+    return path
+
+
+def test_roundtrip(tmp_path):
+    path = _capture(tmp_path, [b"first", b"", b"third"])
+    with MessageLog(path) as log:
+        records = [(ts, bytes(payload)) for ts, payload in log]
+    assert records == [(1000.0, b"first"), (1001.0, b""), (1002.0, b"third")]
+
+
+def test_close_with_payload_view_still_held(tmp_path):
+    path = _capture(tmp_path, [b"alpha", b"beta"])
+    with MessageLog(path) as log:
+        for ts, payload in log:
+            pass
+    # The loop variable still references a view into the mapping.
+    assert bytes(payload) == b"beta"
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    path = _capture(tmp_path, [b"complete", b"cut short"])
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+    with MessageLog(path) as log:
+        assert [bytes(p) for _, p in log] == [b"complete"]
@@ -0,0 +1,69 @@
+# tests/test_world_model.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from decision_engine.world_model import WorldModel
+
+
+def _wall(spacing=0.5, length=20.0, y=0.0):
+    n = int(round(length / spacing)) + 1
+    return [{"x": i * spacing, "y": y} for i in range(n)]
+
+
+def _message(sender, obstacles, timestamp=100.0):
+    return {"vehicle_id": sender, "timestamp": timestamp, "obstacles": obstacles}
+
+
+def test_points_from_one_message_stay_distinct():
+    world = WorldModel(dedup_radius=1.0)
+    world.update(_message("a", _wall()), now=100.0)
+    assert len(world) == 41
+    assert sorted(o["x"] for o in world.obstacles()) == [i * 0.5 for i in range(41)]
+
+
+def test_close_points_from_one_message_are_not_merged():
+    world = WorldModel(dedup_radius=1.0)
+    world.update(_message("a", [{"x": 0.0, "y": 0.0}, {"x": 0.01, "y": 0.0}]), now=100.0)
+    assert len(world) == 2
+    assert world.merged == 0
+
+
+def test_same_wall_from_other_senders_is_deduplicated():
+    world = WorldModel(dedup_radius=1.0)
+    world.update(_message("a", _wall()), now=100.0)
+    world.update(_message("b", [{"x": o["x"] + 0.1, "y": o["y"] - 0.1} for o in _wall()]), now=100.0)
+    world.update(_message("a", _wall(), timestamp=100.1), now=100.1)
+    assert len(world) == 41
+    assert world.merged == 82
+    for o in world.obstacles():
+        assert abs(o["x"] - round(o["x"] * 2) / 2) < 0.1
+
+
+def test_entries_expire_after_ttl():
+    world = WorldModel(ttl=2.0)
+    world.update(_message("a", _wall(length=2.0)), now=100.0)
+    world.expire(101.9)
+    assert len(world) == 5
+    world.expire(102.0)
+    assert len(world) == 0
+
+
+def test_moving_entry_leaves_no_empty_bucket():
+    world = WorldModel(cell_size=1.0, dedup_radius=1.0)
+    world.update(_message("a", [{"x": 0.9, "y": 0.5}]), now=100.0)
+    world.update(_message("b", [{"x": 1.5, "y": 0.5}]), now=100.0)  # mean moves to x=1.2, the next cell
+    assert len(world) == 1
+    assert list(world._grid) == [(1, 0)]
+
+
+def test_clear_resets_counters():
+    world = WorldModel()
+    world.update(_message("a", _wall(length=2.0)), now=100.0)
+    world.update(_message("b", _wall(length=2.0)), now=100.0)
+    world.expire(103.0)
+    world.clear()
+    assert len(world) == 0
+    assert (world.merged, world.inserted, world.expired) == (0, 0, 0)